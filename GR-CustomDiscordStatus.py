@@ -1,21 +1,27 @@
 import time
-import requests
-from bs4 import BeautifulSoup
-from pypresence import Presence
+import hashlib
+import zlib
+import functools
+import random
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from typing import NamedTuple, Optional
+from dataclasses import dataclass
+import argparse
+import asyncio
+from pypresence import AioPresence
 import re
 import json
 import threading
-import tkinter as tk
-from tkinter import ttk, messagebox
-import pystray
-from PIL import Image, ImageDraw
+import queue
+import atexit
+import contextlib
 import math
 import os
 import sys
-import platform
-import subprocess
 
-from win32com.client import Dispatch
+# GUI, tray, HTTP client, HTML parser and Windows shell modules are imported where they're used,
+# so --headless and 304-only refreshes never load more than they need
 
 basePath = os.path.dirname(os.path.realpath(sys.argv[0]))
 
@@ -24,10 +30,9 @@ def get_config_path():
     return os.path.join(appdata, "GoodreadsRPC", "config.json")
 
 configFile = get_config_path()
-
-# Ensure directory exists
-os.makedirs(os.path.dirname(configFile), exist_ok=True)
-
+shelfCacheFile = os.path.join(os.path.dirname(configFile), "shelf_cache.json")
+instanceLockFile = os.path.join(os.path.dirname(configFile), "instance.lock")
+controlKeyFile = os.path.join(os.path.dirname(configFile), "control.key")
 
 # === Global Variables ===
 discordAppId = None
@@ -36,15 +41,6 @@ refreshInterval = 60
 minimizeToTray = True
 StartOnStartup = False
 
-books = {}
-# Variables for current book details
-currentBook = {
-    "isbn": None,
-    "title": None,
-    "author": None,
-    "cover": None,
-    "start": None
-}
 currentISBN = None
 
 # === Events ===
@@ -52,63 +48,480 @@ loopShouldRunEvent = threading.Event()
 stayRunningAfterGUIEvent = threading.Event()
 trayQuitEvent = threading.Event()
 
+# === Scheduler ===
+# asyncio.Event that any thread may set; it belongs to the runtime loop once bind() has run inside it,
+# and a set() that arrives before that is remembered
+class LoopSignal:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loop = None
+        self.event = None
+        self.pending = False
+
+    def bind(self):
+        with self.lock:
+            self.event = asyncio.Event()
+            self.loop = asyncio.get_running_loop()
+            if self.pending:
+                self.pending = False
+                self.event.set()
+
+    def set(self):
+        with self.lock:
+            if self.loop is None:
+                self.pending = True
+                return
+            loop, event = self.loop, self.event
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # The runtime loop has already shut down
+            pass
+
+    def clear(self):
+        if self.event is not None:
+            self.event.clear()
+
+    async def wait(self, timeout=None):
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self.event.clear()
+
+# The presence loop awaits here instead of polling; wake() carries why, so waits end as soon as something changes
+class PresenceScheduler:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reasons = set()
+        self.signal = LoopSignal()
+
+    def bind(self):
+        self.signal.bind()
+
+    def wake(self, reason):
+        with self.lock:
+            self.reasons.add(reason)
+        self.signal.set()
+
+    # Returns the set of wake reasons, empty when the timeout elapsed first
+    async def wait(self, timeout=None):
+        with self.lock:
+            pending = bool(self.reasons)
+        if pending:
+            self.signal.clear()
+        else:
+            await self.signal.wait(timeout)
+        with self.lock:
+            reasons, self.reasons = self.reasons, set()
+        return reasons
+
+presenceScheduler = PresenceScheduler()
+root = None
+trayIcon = None
+# Virtual events for the Tk thread, queued by other threads and delivered by the gui-events thread
+guiEvents = queue.SimpleQueue()
+guiEventsStopMarker = object()
+
 # === Logging Function ===
-def log(message):
+LOG_DEBUG = 10
+LOG_INFO = 20
+LOG_WARNING = 30
+LOG_ERROR = 40
+logLevelNames = {LOG_DEBUG: "DEBUG", LOG_INFO: "INFO", LOG_WARNING: "WARNING", LOG_ERROR: "ERROR"}
+logMinLevel = LOG_INFO
+logMaxBytes = 1024 * 1024
+logBackupCount = 3
+# How long the writer keeps collecting lines after the first one before it touches the disk
+logBatchSeconds = 0.5
+logQueue = queue.SimpleQueue()
+logWriterThread = None
+logWriterLock = threading.Lock()
+logStopMarker = object()
+
+def log(message, level=LOG_INFO):
+    global logWriterThread
+    if level < logMinLevel:
+        return
+    logQueue.put(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {logLevelNames.get(level, level)} - {message}\n")
+    if logWriterThread is None:
+        with logWriterLock:
+            if logWriterThread is None:
+                logWriterThread = threading.Thread(target=log_writer, name="log-writer", daemon=True)
+                logWriterThread.start()
+
+# Quiet mode only keeps warnings and errors regardless of the configured level
+def configure_logging(levelName="INFO", quiet=False):
+    global logMinLevel
+    levels = {name: level for level, name in logLevelNames.items()}
+    logMinLevel = levels.get(str(levelName).upper(), LOG_INFO)
+    if quiet:
+        logMinLevel = max(logMinLevel, LOG_WARNING)
+
+def rotate_log_file(logFilePath):
+    for index in range(logBackupCount - 1, 0, -1):
+        source = f"{logFilePath}.{index}"
+        if os.path.exists(source):
+            os.replace(source, f"{logFilePath}.{index + 1}")
+    if logBackupCount > 0:
+        os.replace(logFilePath, f"{logFilePath}.1")
+    else:
+        os.remove(logFilePath)
+
+def write_log_lines(lines):
     try:
         logFilePath = os.path.join(basePath, "log.txt")
+        data = "".join(lines)
+        if os.path.exists(logFilePath) and os.path.getsize(logFilePath) + len(data) > logMaxBytes:
+            rotate_log_file(logFilePath)
         with open(logFilePath, "a") as logFile:
-            logFile.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - {message}\n")
+            logFile.write(data)
     except Exception as e:
         print(f"Failed to log message: {e}")
 
+def log_writer():
+    stopping = False
+    while not stopping:
+        item = logQueue.get()
+        if item is logStopMarker:
+            break
+        lines = [item]
+        deadline = time.monotonic() + logBatchSeconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = logQueue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is logStopMarker:
+                stopping = True
+                break
+            lines.append(item)
+        write_log_lines(lines)
+
+def flush_log():
+    if logWriterThread is not None and logWriterThread.is_alive():
+        logQueue.put(logStopMarker)
+        logWriterThread.join(timeout=2)
+
+atexit.register(flush_log)
+
 # === Load Configuration ===
-def load_config():
-    try:
-        with open(configFile, "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        defaultConfig = {
-            "discordAppId": "1356666997760462859",
-            "goodreadsUserId": "YOUR_GOODREADS_USER_ID",
-            "keepRunning": True,
-            "minimizeToTray": True,
-            "startOnStartup": False,
-            "refreshInterval": 60,
-            "currentISBN": None
-        }
-        with open(configFile, "w") as f:
-            json.dump(defaultConfig, f, indent=4)
-        return defaultConfig
+defaultConfig = {
+    "discordAppId": "1356666997760462859",
+    "goodreadsUserId": "YOUR_GOODREADS_USER_ID",
+    "keepRunning": True,
+    "minimizeToTray": True,
+    "startOnStartup": False,
+    "refreshInterval": 60,
+    "currentISBN": None,
+    "logLevel": "INFO",
+    "quietLogging": False,
+    "metricsPort": None,
+    "metricsStatusFile": False,
+    "shelfSource": "auto",
+    "rotationEnabled": False,
+    "rotationBooks": [],
+    "rotationDwell": 60
+}
+
+def write_json_atomic(path, data):
+    tempPath = f"{path}.tmp"
+    with open(tempPath, "w") as f:
+        json.dump(data, f, indent=4)
+    os.replace(tempPath, path)
+
+# Single in-memory copy of config.json. Writers call update(); listeners hear only about keys whose
+# value actually changed, and the file is rewritten once after a quiet period instead of on every edit
+class ConfigStore:
+    def __init__(self, path, defaults, writeDelay=1.0):
+        self.path = path
+        self.values = dict(defaults)
+        self.writeDelay = writeDelay
+        self.lock = threading.RLock()
+        self.listeners = []
+        self.writeTimer = None
+        self.dirty = False
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            self.dirty = True
+            self.flush()
+            return self
+        with self.lock:
+            self.values.update(stored)
+        return self
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self.values.get(key, default)
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.values)
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def update(self, **changes):
+        with self.lock:
+            changed = {key: value for key, value in changes.items() if self.values.get(key) != value}
+            if not changed:
+                return changed
+            self.values.update(changed)
+            self.dirty = True
+            self.schedule_write()
+        for callback in self.listeners:
+            try:
+                callback(changed)
+            except Exception as e:
+                log(f"Config listener failed: {e}", LOG_ERROR)
+        return changed
+
+    def schedule_write(self):
+        with self.lock:
+            if self.writeTimer is not None:
+                self.writeTimer.cancel()
+            self.writeTimer = threading.Timer(self.writeDelay, self.flush)
+            self.writeTimer.daemon = True
+            self.writeTimer.start()
+
+    def flush(self):
+        with self.lock:
+            if self.writeTimer is not None:
+                self.writeTimer.cancel()
+                self.writeTimer = None
+            if not self.dirty:
+                return
+            data = dict(self.values)
+            self.dirty = False
+        try:
+            write_json_atomic(self.path, data)
+            log("Config saved.", LOG_DEBUG)
+        except Exception as e:
+            log(f"Failed to save config: {e}", LOG_ERROR)
+
+configStore = ConfigStore(configFile, defaultConfig)
+atexit.register(configStore.flush)
+
+# Mirrors config values into the module globals and runs each field's side effect only when that field changed
+def on_config_changed(changes):
+    global discordAppId, goodreadsUserId, refreshInterval, minimizeToTray, StartOnStartup, currentISBN
+    if "discordAppId" in changes:
+        discordAppId = changes["discordAppId"]
+        discordConnection.set_app_id(discordAppId)
+    if "goodreadsUserId" in changes:
+        goodreadsUserId = changes["goodreadsUserId"]
+        presenceScheduler.wake("user")
+    if "refreshInterval" in changes:
+        refreshInterval = changes["refreshInterval"]
+        presenceScheduler.wake("interval")
+    if "minimizeToTray" in changes:
+        minimizeToTray = changes["minimizeToTray"]
+    if "startOnStartup" in changes:
+        StartOnStartup = changes["startOnStartup"]
+        set_startup_enabled()
+    if "currentISBN" in changes:
+        currentISBN = changes["currentISBN"]
+        presenceScheduler.wake("book")
+    if "keepRunning" in changes:
+        if changes["keepRunning"]:
+            stayRunningAfterGUIEvent.set()
+        else:
+            stayRunningAfterGUIEvent.clear()
+    if "shelfSource" in changes:
+        presenceScheduler.wake("source")
+    if "rotationEnabled" in changes or "rotationBooks" in changes or "rotationDwell" in changes:
+        presenceScheduler.wake("rotation")
+    if "logLevel" in changes or "quietLogging" in changes:
+        configure_logging(configStore.get("logLevel", "INFO"), configStore.get("quietLogging", False))
 
 # === Load Config and Initialize Variables ===
-config = load_config()
-discordAppId = config.get("discordAppId")
-goodreadsUserId = config.get("goodreadsUserId")
-refreshInterval = config.get("refreshInterval", 60)
-minimizeToTray = config.get("minimizeToTray", True)
-StartOnStartup = config.get("startOnStartup", False)
-currentISBN = config.get("currentISBN", None)
-
-if config.get("keepRunning", True):
-    stayRunningAfterGUIEvent.set()
-
-# only do this if running on github actions
-if os.getenv("GITHUB_ACTIONS") == "true" or "CI" in os.environ:
+def init_config():
+    global discordAppId, goodreadsUserId, refreshInterval, minimizeToTray, StartOnStartup, currentISBN, goodreadsBaseUrl
+    # Ensure directory exists
+    os.makedirs(os.path.dirname(configFile), exist_ok=True)
+    configStore.load()
+    config = configStore.snapshot()
+    discordAppId = config.get("discordAppId")
+    goodreadsUserId = config.get("goodreadsUserId")
+    refreshInterval = config.get("refreshInterval", 60)
+    minimizeToTray = config.get("minimizeToTray", True)
+    StartOnStartup = config.get("startOnStartup", False)
+    currentISBN = config.get("currentISBN", None)
+    # Undocumented override used by benchmarks/harness.py to point at a local stand-in
+    goodreadsBaseUrl = config.get("goodreadsBaseUrl") or goodreadsBaseUrl
+    configure_logging(config.get("logLevel", "INFO"), config.get("quietLogging", False))
+    configStore.subscribe(on_config_changed)
+
+    if config.get("keepRunning", True):
+        stayRunningAfterGUIEvent.set()
+
+    # only do this if running on github actions
+    if os.getenv("GITHUB_ACTIONS") == "true" or "CI" in os.environ:
+        try:
+            with open("/tmp/grrpc_launched.txt", "w") as f:
+                f.write("Launched successfully.")
+        except Exception as e:
+            with open("/tmp/grrpc_launch_error.txt", "w") as f:
+                f.write(str(e))
+
+# === Metrics ===
+# In-process counters, gauges and timing summaries for the fetch -> parse -> presence pipeline
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.startedAt = time.time()
+        self.counters = {}
+        self.gauges = {}
+        self.timings = {}
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def observe(self, name, seconds):
+        with self.lock:
+            timing = self.timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0, "last": 0.0})
+            timing["count"] += 1
+            timing["total"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+            timing["last"] = seconds
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self):
+        with self.lock:
+            snapshot = {
+                "uptimeSeconds": time.time() - self.startedAt,
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "timings": {name: dict(timing) for name, timing in self.timings.items()},
+            }
+        hits = snapshot["counters"].get("shelf_revalidated", 0)
+        misses = snapshot["counters"].get("shelf_parsed", 0)
+        snapshot["cacheHitRate"] = hits / (hits + misses) if hits + misses else None
+        return snapshot
+
+    def to_prometheus(self):
+        snapshot = self.snapshot()
+        lines = [f"grrpc_uptime_seconds {snapshot['uptimeSeconds']:.3f}"]
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"grrpc_{name}_total {value}")
+        for name, value in sorted(snapshot["gauges"].items()):
+            lines.append(f"grrpc_{name} {value}")
+        for name, timing in sorted(snapshot["timings"].items()):
+            lines.append(f"grrpc_{name}_count {timing['count']}")
+            lines.append(f"grrpc_{name}_sum {timing['total']:.6f}")
+            lines.append(f"grrpc_{name}_max {timing['max']:.6f}")
+        if snapshot["cacheHitRate"] is not None:
+            lines.append(f"grrpc_shelf_cache_hit_ratio {snapshot['cacheHitRate']:.4f}")
+        return "\n".join(lines) + "\n"
+
+metrics = Metrics()
+statusFile = os.path.join(os.path.dirname(configFile), "status.json")
+
+def write_status_file():
     try:
-        with open("/tmp/grrpc_launched.txt", "w") as f:
-            f.write("Launched successfully.")
+        write_json_atomic(statusFile, metrics.snapshot())
     except Exception as e:
-        with open("/tmp/grrpc_launch_error.txt", "w") as f:
-            f.write(str(e))
+        log(f"Failed to write status file: {e}", LOG_ERROR)
+
+# Bound to loopback only; the long poll interval keeps the idle server from waking up.
+# http.server is only imported when metricsPort is set
+def start_metrics_server(port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = metrics.to_prometheus().encode("utf-8")
+                contentType = "text/plain; version=0.0.4"
+            elif self.path in ("/", "/status"):
+                body = json.dumps(metrics.snapshot(), indent=4).encode("utf-8")
+                contentType = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", contentType)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            log(f"Metrics endpoint: {format % args}", LOG_DEBUG)
+
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", port), MetricsRequestHandler)
+    except OSError as e:
+        log(f"Could not start metrics endpoint on port {port}: {e}", LOG_ERROR)
+        return None
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 3600}, name="metrics", daemon=True).start()
+    log(f"Metrics available at http://127.0.0.1:{port}/metrics and /status")
+    return server
+
+# === Profiling ===
+profileFile = os.path.join(os.path.dirname(configFile), "profile.pstats")
+profilingEnabled = False
+memoryTracingEnabled = False
+
+def run_profiled(target):
+    if not profilingEnabled:
+        return target()
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(target)
+    finally:
+        profiler.dump_stats(profileFile)
+        log(f"CPU profile written to {profileFile}")
+
+def start_memory_tracing():
+    import tracemalloc
+    tracemalloc.start(10)
+    log("Memory tracing enabled.")
+
+def log_memory_snapshot(limit=15):
+    if not memoryTracingEnabled:
+        return
+    import tracemalloc
+    if not tracemalloc.is_tracing():
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    metrics.set_gauge("traced_memory_bytes", current)
+    metrics.set_gauge("traced_memory_peak_bytes", peak)
+    log(f"Traced memory: {current / 1024:.0f} KiB current, {peak / 1024:.0f} KiB peak.")
+    for stat in tracemalloc.take_snapshot().statistics("lineno")[:limit]:
+        log(f"  {stat}")
 
 # === Startup Shortcut Creation ===
 def set_startup_enabled():
+    if sys.platform != "win32":
+        log("Startup shortcut is only supported on Windows.", LOG_DEBUG)
+        return
     startup_dir = os.path.join(os.getenv('APPDATA'), "Microsoft\\Windows\\Start Menu\\Programs\\Startup")
     script_path = os.path.realpath(sys.argv[0])
     shortcut_path = os.path.join(startup_dir, "GoodreadsRPC.lnk")
 
     if StartOnStartup:
         try:
+            from win32com.client import Dispatch
             shell = Dispatch("WScript.Shell")
             shortcut = shell.CreateShortCut(shortcut_path)
             shortcut.Targetpath = script_path
@@ -117,17 +530,18 @@ def set_startup_enabled():
             shortcut.save()
             log("Startup shortcut created.")
         except Exception as e:
-            log(f"Failed to create startup shortcut: {e}")
+            log(f"Failed to create startup shortcut: {e}", LOG_ERROR)
     else:
         try:
             if os.path.exists(shortcut_path):
                 os.remove(shortcut_path)
                 log("Startup shortcut removed.")
         except Exception as e:
-            log(f"Failed to remove startup shortcut: {e}")
+            log(f"Failed to remove startup shortcut: {e}", LOG_ERROR)
 
 # === Create System Tray Icon ===
 def create_image():
+    from PIL import Image, ImageDraw
     size = (96, 64)
     image = Image.new("RGBA", size, color=(30, 30, 30, 0))
     d = ImageDraw.Draw(image)
@@ -149,18 +563,64 @@ def create_image():
 
     return image
 
+# Tk isn't thread-safe, so tray, control and runtime updates reach the GUI thread as virtual events.
+# A cross-thread event_generate is a blocking call marshalled into Tk's loop, which would stall the asyncio
+# loop until Tk got round to it, so other threads only queue the event name and never touch Tcl
+def post_gui_event(eventName):
+    if root is None:
+        return
+    guiEvents.put(eventName)
+
+# Blocks on the queue and makes the marshalled event_generate call itself, so Tk is only woken when there is
+# something to deliver; repeats queued while it waited on Tk (state bursts) are delivered once
+def gui_event_poster():
+    while True:
+        pending = [guiEvents.get()]
+        while True:
+            try:
+                pending.append(guiEvents.get_nowait())
+            except queue.Empty:
+                break
+        for eventName in dict.fromkeys(pending):
+            if eventName is guiEventsStopMarker:
+                return
+            window = root
+            if window is None:
+                continue
+            try:
+                window.event_generate(eventName, when="tail")
+            except Exception as e:
+                log(f"Could not post {eventName} to GUI: {e}", LOG_DEBUG)
+
+# root is cleared first so no thread posts to, or reads from, a window that is going away
+def destroy_gui():
+    global root
+    window, root = root, None
+    if window is not None:
+        window.destroy()
+
 def on_tray_quit(icon, item):
     log("Tray icon exit triggered.")
-    trayQuitEvent.set()
+    stop_presence_runtime()
+    post_gui_event("<<TrayQuit>>")
     icon.stop()
 
+def tray_status_text(item):
+    book = appState.book
+    if appState.paused or book is None:
+        return "Not showing a book"
+    return f"Showing: {book.title}"
+
 def show_tray():
-    icon = pystray.Icon("GoodreadsRPC")
+    global trayIcon
+    import pystray
+    icon = trayIcon = pystray.Icon("GoodreadsRPC")
     icon.icon = create_image()
     icon.title = "Goodreads RPC"
     icon.menu = pystray.Menu(
+        pystray.MenuItem(tray_status_text, None, enabled=False),
         pystray.MenuItem("Quit", on_tray_quit),
-        pystray.MenuItem("Open", lambda icon, item: showGUI()),
+        pystray.MenuItem("Open", lambda icon, item: post_gui_event("<<ShowGUI>>")),
     )
     icon.run()
 
@@ -169,194 +629,1372 @@ def showGUI():
     root.deiconify()
     root.lift()
     root.focus_force()
-    log("GUI should be visible now.")
-    log("Setting loopShouldRunEvent to True.")
+    log("GUI should be visible now.", LOG_DEBUG)
+    log("Setting loopShouldRunEvent to True.", LOG_DEBUG)
     loopShouldRunEvent.set()
+    presenceScheduler.wake("resume")
 
-# === Goodreads Getter ===
-def get_currently_reading(userId):
-    url = f"https://www.goodreads.com/review/list/{userId}?shelf=currently-reading"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code != 200:
-            log(f"Failed to fetch Goodreads page: {response.status_code}")
-            return None
-        soup = BeautifulSoup(response.text, 'html.parser')
-        bookTable = soup.find("table", {"id": "books"})
-        log("Book table found." if bookTable else "No book table found.")
-        if not bookTable:
-            log("No book table found.")
+# === Book Model ===
+coverSizePattern = re.compile(r'\._[A-Z0-9]+_(?=\.(jpg|jpeg|png))', re.IGNORECASE)
+
+@dataclass(frozen=True, slots=True)
+class Book:
+    key: str
+    isbn: Optional[str]
+    title: str
+    author: str
+    cover: str
+    startDate: Optional[str]
+    startTimestamp: Optional[int]
+
+    # Books without an ISBN are keyed by title and author, matching the currentISBN values saved in config
+    @classmethod
+    def create(cls, isbn, title, author, cover, startDate):
+        startTimestamp = None
+        if startDate:
+            try:
+                startTimestamp = int(time.mktime(time.strptime(startDate, "%b %d, %Y")))
+            except ValueError:
+                log(f"Could not parse start date '{startDate}' for {title}.", LOG_WARNING)
+        return cls(
+            key=isbn or f"noisbn-{title}-{author}",
+            isbn=isbn or None,
+            title=title,
+            author=author,
+            cover=coverSizePattern.sub("", cover) if cover else cover,
+            startDate=startDate,
+            startTimestamp=startTimestamp,
+        )
+
+    @classmethod
+    def from_row(cls, row):
+        key, title, author, cover, startDate = row
+        return cls.create(None if key.startswith("noisbn-") else key, title, author, cover, startDate)
+
+    def to_row(self):
+        return [self.key, self.title, self.author, self.cover, self.startDate]
+
+    @property
+    def titleAuthorKey(self):
+        return (self.title.casefold(), self.author.casefold())
+
+# Difference between two shelves, keyed by book key; modified holds the new version of each book
+class ShelfDelta(NamedTuple):
+    added: dict
+    removed: dict
+    modified: dict
+    reordered: bool
+
+    @property
+    def empty(self):
+        return not (self.added or self.removed or self.modified or self.reordered)
+
+# Current shelf in page order, indexed by key (ISBN or no-ISBN key) and by title/author.
+# Listeners get a ShelfDelta after each replace() that changed anything
+class ShelfStore:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.byKey = {}
+        self.byTitleAuthor = {}
+        self.labels = {}
+        self.listeners = []
+
+    def subscribe(self, callback):
+        self.listeners.append(callback)
+
+    def replace(self, books):
+        byKey = {}
+        byTitleAuthor = {}
+        for book in books:
+            byKey[book.key] = book
+            byTitleAuthor.setdefault(book.titleAuthorKey, book)
+        labels = {}
+        for book in byKey.values():
+            label = f"{book.title} by {book.author}"
+            labels[f"{label} ({book.key})" if label in labels else label] = book.key
+        with self.lock:
+            previous = self.byKey
+            self.byKey, self.byTitleAuthor, self.labels = byKey, byTitleAuthor, labels
+        added = {key: book for key, book in byKey.items() if key not in previous}
+        removed = {key: book for key, book in previous.items() if key not in byKey}
+        delta = ShelfDelta(
+            added=added,
+            removed=removed,
+            modified={key: book for key, book in byKey.items() if key in previous and previous[key] != book},
+            reordered=not (added or removed) and list(previous) != list(byKey),
+        )
+        if not delta.empty:
+            for callback in self.listeners:
+                try:
+                    callback(delta)
+                except Exception as e:
+                    log(f"Shelf listener failed: {e}", LOG_ERROR)
+        return delta
+
+    def get(self, key):
+        book = self.byKey.get(key)
+        if book is None and key and key.startswith("noisbn-"):
+            title, _, author = key[len("noisbn-"):].rpartition("-")
+            book = self.byTitleAuthor.get((title.casefold(), author.casefold()))
+        return book
+
+    def first(self):
+        return next(iter(self.byKey.values()), None)
+
+    def label_for(self, key):
+        for label, labelKey in self.labels.items():
+            if labelKey == key:
+                return label
+        return None
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self.byKey)
+
+    def __iter__(self):
+        return iter(list(self.byKey.values()))
+
+shelfStore = ShelfStore()
+
+# === App State ===
+# What the runtime is showing, replaced as a whole on every change so the Tk and tray threads read one
+# consistent version without locking. labels is the ShelfStore dict, which is never mutated after a replace
+# shelfStatus is "loading" until the cache or a fetch answers, then "cached", "ready", "empty" or "failed"
+class AppState(NamedTuple):
+    book: Optional[Book] = None
+    labels: dict = {}
+    paused: bool = False
+    shelfStatus: str = "loading"
+
+    @property
+    def selectedLabel(self):
+        if self.book is None:
             return None
-        rows = bookTable.find_all("tr", {"id": lambda x: x and x.startswith("review_")})
-        log(f"Found {len(rows)} book rows.")
-        if not rows:
-            log("No book rows found.")
+        return next((label for label, key in self.labels.items() if key == self.book.key), None)
+
+appState = AppState()
+appStateLock = threading.Lock()
+
+def publish_state(**changes):
+    global appState
+    with appStateLock:
+        state = appState._replace(**changes)
+        if state == appState:
+            return
+        appState = state
+    post_gui_event("<<StateChanged>>")
+
+# === HTTP Fetch Layer ===
+goodreadsBaseUrl = "https://www.goodreads.com"
+httpSession = None
+httpTimeoutSeconds = 10
+# Per-URL revalidation state: etag, lastModified, tableHash and the books parsed from that table
+shelfFetchState = {}
+# Shelf pages are scanned as bytes while they stream in; see read_shelf_stream
+bookTablePattern = re.compile(rb'<table[^>]*\bid=["\']books["\']', re.IGNORECASE)
+bookTableEnd = b"</table>"
+bookRowPattern = re.compile(r'<tr[^>]*\bid=["\']review_\d+["\'].*?</tr>', re.IGNORECASE | re.DOTALL)
+paginationPattern = re.compile(rb'<div[^>]*\bid=["\']reviewPagination["\'][^>]*>(.*?)</div>', re.IGNORECASE | re.DOTALL)
+pageLinkPattern = re.compile(rb'[?&;]page=(\d+)')
+# Bytes kept while looking for the table so a tag split across two chunks is still found
+streamOverlapBytes = 1024
+# Give up on finding the pagination links once this much has been read past the table
+maxPaginationScanBytes = 256 * 1024
+streamChunkBytes = 16 * 1024
+maxRetryAfterSeconds = 6 * 3600
+# Upper bound on concurrent requests to Goodreads, enforced by the session's connector
+maxPageWorkers = 4
+
+# Spaces out request starts to each host; off unless batch mode sets a rate
+class HostRateLimiter:
+    def __init__(self, interval=0):
+        self.interval = interval
+        self.nextSlot = {}
+
+    async def acquire(self, url):
+        if self.interval <= 0:
+            return
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+        slot = max(now, self.nextSlot.get(host, now))
+        self.nextSlot[host] = slot + self.interval
+        if slot > now:
+            metrics.observe("rate_limit_wait_seconds", slot - now)
+            await asyncio.sleep(slot - now)
+
+    # A 429/503 pushes every later request to that host back by its Retry-After
+    def hold(self, url, seconds):
+        if self.interval <= 0 or not seconds:
+            return
+        host = urlsplit(url).netloc
+        self.nextSlot[host] = max(self.nextSlot.get(host, 0), time.monotonic() + seconds)
+
+hostRateLimiter = HostRateLimiter()
+
+class ShelfFetchResult(NamedTuple):
+    books: Optional[dict]
+    changed: bool
+    retryAfter: Optional[float] = None
+    source: Optional[str] = None
+
+# Must be called on the runtime loop; the session is bound to it
+def get_http_session():
+    global httpSession
+    if httpSession is None or httpSession.closed:
+        import aiohttp
+        httpSession = aiohttp.ClientSession(
+            headers={"User-Agent": "Mozilla/5.0", "Accept-Encoding": "gzip, deflate"},
+            # Bodies are inflated by read_body so fetch_bytes can count what actually came over the wire
+            auto_decompress=False,
+            connector=aiohttp.TCPConnector(limit=maxPageWorkers),
+            # Per connect and per read, so time spent queued for a pooled connection doesn't count against it
+            timeout=aiohttp.ClientTimeout(sock_connect=httpTimeoutSeconds, sock_read=httpTimeoutSeconds),
+        )
+    return httpSession
+
+async def close_http_session():
+    global httpSession
+    if httpSession is not None:
+        await httpSession.close()
+        httpSession = None
+
+def get_shelf_url(userId, page=1):
+    url = f"{goodreadsBaseUrl}/review/list/{userId}?shelf=currently-reading"
+    return url if page == 1 else f"{url}&page={page}"
+
+# Retry-After is either a number of seconds or an HTTP date
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
             return None
-        books = {}
-        for row in rows:
-            log("Processing a book row.")
-            title = row.find("td", class_="field title").find("a").get_text(strip=True)
-            author = row.find("td", class_="field author").find("a").get_text(strip=True)
-            coverArt = row.find("td", class_="field cover").find("img")["src"]
-            coverArt = re.sub(r'\._[A-Z0-9]+_(?=\.(jpg|jpeg|png))', '', coverArt, flags=re.IGNORECASE)
-            startDateSpan = row.find("td", class_="field date_started").find("span", class_="date_started_value")
-            startDate = startDateSpan.get_text(strip=True) if startDateSpan else None
-            isbn = row.find("td", class_="field isbn").find("div", class_="value").get_text(strip=True) if row.find("td", class_="field isbn").find("div", class_="value").get_text(strip=True) else f"noisbn-{title}-{author}"
-            books[isbn] = (isbn, title, author, coverArt, startDate)
+    return min(max(seconds, 0), maxRetryAfterSeconds)
+
+def parse_page_count(paginationHtml):
+    return max([1] + [int(page) for page in pageLinkPattern.findall(paginationHtml)])
+
+# Reads a streamed shelf page only as far as needed: bytes before the #books table are dropped as they
+# arrive and reading stops at the table's closing tag. The pagination links come after the table, so when
+# they are wanted reading continues until they have been seen
+class ShelfStreamScanner:
+    def __init__(self, wantPageCount=True):
+        self.wantPageCount = wantPageCount
+        self.buffer = b""
+        self.tableBytes = None
+        self.pageCount = 1
+        self.scanFrom = 0
+        self.inTable = False
+
+    # Returns True once the rest of the page is not needed
+    def feed(self, chunk):
+        self.buffer += chunk
+        if not self.inTable:
+            match = bookTablePattern.search(self.buffer)
+            if not match:
+                self.buffer = self.buffer[-streamOverlapBytes:]
+                return False
+            self.buffer = self.buffer[match.start():]
+            self.inTable = True
+        if self.tableBytes is None:
+            end = self.buffer.find(bookTableEnd, self.scanFrom)
+            if end == -1:
+                self.scanFrom = max(0, len(self.buffer) - len(bookTableEnd))
+                return False
+            self.tableBytes = self.buffer[:end + len(bookTableEnd)]
+            self.buffer = self.buffer[end + len(bookTableEnd):]
+            if not self.wantPageCount:
+                return True
+        match = paginationPattern.search(self.buffer)
+        if match:
+            self.pageCount = parse_page_count(match.group(1))
+            return True
+        return len(self.buffer) > maxPaginationScanBytes
+
+def get_fetch_state(url):
+    return shelfFetchState.setdefault(url, {"etag": None, "lastModified": None, "tableHash": None, "books": None})
+
+def conditional_headers(state):
+    headers = {}
+    if state["books"] is not None:
+        if state["etag"]:
+            headers["If-None-Match"] = state["etag"]
+        if state["lastModified"]:
+            headers["If-Modified-Since"] = state["lastModified"]
+    return headers
+
+# Yields the decoded body chunk by chunk while counting the compressed bytes received in fetch_bytes
+async def read_body(response, chunkBytes=streamChunkBytes):
+    encoding = response.headers.get("Content-Encoding", "").lower()
+    # wbits | 32 accepts both gzip and zlib headers, which covers what servers send for "deflate"
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32) if encoding in ("gzip", "deflate") else None
+    async for chunk in response.content.iter_chunked(chunkBytes):
+        metrics.increment("fetch_bytes", len(chunk))
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        if chunk:
+            yield chunk
+    if decompressor is not None:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+# The page is streamed and the connection dropped once the table (and, for page 1, the page count) is read
+async def fetch_shelf_page(url, wantPageCount=True):
+    state = get_fetch_state(url)
+    scanner = ShelfStreamScanner(wantPageCount)
+    await hostRateLimiter.acquire(url)
+    with metrics.timer("fetch_seconds"):
+        async with get_http_session().get(url, headers=conditional_headers(state)) as response:
+            if response.status == 200:
+                async with contextlib.aclosing(read_body(response)) as body:
+                    async for chunk in body:
+                        if scanner.feed(chunk):
+                            response.close()
+                            break
+    metrics.increment("fetch_requests")
+    if response.status == 304 and state["books"] is not None:
+        log("Shelf page not modified (304), reusing parsed books.", LOG_DEBUG)
+        metrics.increment("shelf_revalidated")
+        return ShelfFetchResult(state["books"], False)
+    if response.status != 200:
+        log(f"Failed to fetch Goodreads page: {response.status}", LOG_ERROR)
+        metrics.increment("fetch_errors")
+        retryAfter = parse_retry_after(response.headers.get("Retry-After"))
+        hostRateLimiter.hold(url, retryAfter)
+        return ShelfFetchResult(None, False, retryAfter)
+    state["etag"] = response.headers.get("ETag")
+    state["lastModified"] = response.headers.get("Last-Modified")
+    state["pageCount"] = scanner.pageCount
+    if not scanner.tableBytes:
+        log("No book table found.", LOG_WARNING)
+        return ShelfFetchResult(None, False)
+    tableHash = hashlib.sha1(scanner.tableBytes).hexdigest()
+    tableHtml = scanner.tableBytes.decode(response.charset or "utf-8", errors="replace")
+    if tableHash == state["tableHash"] and state["books"] is not None:
+        log("Book table unchanged, skipping parse.", LOG_DEBUG)
+        metrics.increment("shelf_revalidated")
+        return ShelfFetchResult(state["books"], False)
+    with metrics.timer("parse_seconds"):
+        books = parse_changed_rows(tableHtml, state)
+    metrics.increment("shelf_parsed")
+    if books is not None:
+        state["tableHash"] = tableHash
+        state["books"] = books
+    return ShelfFetchResult(books, True)
+
+# === Goodreads Getter ===
+def parse_book_row(row):
+    fields = {}
+    for cell in row.find_all("td", recursive=False):
+        classes = cell.get("class") or ()
+        if "field" in classes:
+            for className in classes:
+                if className != "field":
+                    fields[className] = cell
+    title = fields["title"].a.get_text(strip=True)
+    author = fields["author"].a.get_text(strip=True)
+    coverArt = fields["cover"].img["src"]
+    startDateSpan = fields["date_started"].find("span", class_="date_started_value") if "date_started" in fields else None
+    startDate = startDateSpan.get_text(strip=True) if startDateSpan else None
+    isbnValue = fields["isbn"].find("div", class_="value") if "isbn" in fields else None
+    isbn = isbnValue.get_text(strip=True) if isbnValue else None
+    return Book.create(isbn, title, author, coverArt, startDate)
+
+# Books in row order, empty for a shelf with nothing on it, or None when the table is missing
+def parse_book_rows(html):
+    from bs4 import BeautifulSoup, SoupStrainer
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer("table", id="books"))
+    bookTable = soup.find("table", {"id": "books"})
+    log("Book table found." if bookTable else "No book table found.", LOG_DEBUG)
+    if not bookTable:
+        return None
+    rows = bookTable.find_all("tr", id=lambda x: x and x.startswith("review_"))
+    log(f"Found {len(rows)} book rows.", LOG_DEBUG)
+    if not rows:
+        log("No book rows found, the shelf is empty.", LOG_DEBUG)
+    return [parse_book_row(row) for row in rows]
+
+def parse_book_table(html):
+    rows = parse_book_rows(html)
+    if rows is None:
+        return None
+    return {book.key: book for book in rows}
+
+# Each row is fingerprinted by its markup and only rows this page hasn't served before go through
+# BeautifulSoup; the rest reuse the Book parsed last time
+def parse_changed_rows(tableHtml, state):
+    previous = state.get("rowBooks") or {}
+    rows = bookRowPattern.findall(tableHtml)
+    fingerprints = [hashlib.sha1(row.encode("utf-8")).hexdigest() for row in rows]
+    newRows = [row for row, fingerprint in zip(rows, fingerprints) if fingerprint not in previous]
+    parsed = parse_book_rows(f'<table id="books">{"".join(newRows)}</table>') if newRows else []
+    if not rows or parsed is None or len(parsed) != len(newRows):
+        log("Row fingerprints did not line up with parsed rows, parsing the whole table.", LOG_DEBUG)
+        state["rowBooks"] = {}
+        books = parse_book_table(tableHtml)
+        if books:
+            metrics.increment("rows_parsed", len(books))
+        return books
+    fresh = iter(parsed)
+    rowBooks = {}
+    books = {}
+    for fingerprint in fingerprints:
+        book = previous[fingerprint] if fingerprint in previous else next(fresh)
+        rowBooks[fingerprint] = book
+        books[book.key] = book
+    state["rowBooks"] = rowBooks
+    metrics.increment("rows_parsed", len(newRows))
+    metrics.increment("rows_reused", len(rows) - len(newRows))
+    log(f"Parsed {len(newRows)} changed row(s), reused {len(rows) - len(newRows)}.", LOG_DEBUG)
+    return books
+
+# Pages 2..N are fetched maxPageWorkers at a time and collected by page number as each one arrives, then
+# merged in page order so shelf order doesn't depend on which response came back first. Any failed page fails
+# the whole fetch so a partial shelf is never mistaken for removed books
+async def fetch_remaining_pages(userId, pageCount, books):
+    pageSlots = asyncio.Semaphore(maxPageWorkers)
+
+    async def fetch_page(page):
+        async with pageSlots:
+            return page, await fetch_shelf_page(get_shelf_url(userId, page), False)
+
+    tasks = [asyncio.ensure_future(fetch_page(page)) for page in range(2, pageCount + 1)]
+    pageBooks = {}
+    changed = False
+    try:
+        for nextResult in asyncio.as_completed(tasks):
+            page, result = await nextResult
+            if result.books is None:
+                return ShelfFetchResult(None, False, result.retryAfter)
+            pageBooks[page] = result.books
+            changed = changed or result.changed
+    finally:
+        for task in tasks:
+            task.cancel()
+    for page in sorted(pageBooks):
+        books.update(pageBooks[page])
+    return ShelfFetchResult(books, changed)
+
+async def fetch_all_pages(userId):
+    firstUrl = get_shelf_url(userId)
+    first = await fetch_shelf_page(firstUrl)
+    if first.books is None:
+        return first
+    state = shelfFetchState[firstUrl]
+    pageCount = state.get("pageCount", 1)
+    pageCountChanged = pageCount != state.get("mergedPageCount", pageCount)
+    state["mergedPageCount"] = pageCount
+    if pageCount == 1:
+        return first._replace(changed=first.changed or pageCountChanged)
+    log(f"Shelf has {pageCount} pages, fetching the rest concurrently.", LOG_DEBUG)
+    rest = await fetch_remaining_pages(userId, pageCount, dict(first.books))
+    if rest.books is None:
+        return rest
+    return ShelfFetchResult(rest.books, first.changed or rest.changed or pageCountChanged)
+
+# === Shelf Sources ===
+# Every source turns a user's currently-reading shelf into a ShelfFetchResult tagged with the source's name.
+# Revalidation state for each source lives in shelfFetchState under the URLs from page_url()
+class HtmlShelfSource:
+    name = "html"
+
+    def page_url(self, userId, page=1):
+        return get_shelf_url(userId, page)
+
+    def page_urls(self, userId):
+        state = shelfFetchState.get(self.page_url(userId)) or {}
+        return [self.page_url(userId, page) for page in range(1, state.get("pageCount", 1) + 1)]
+
+    def known_books(self, userId):
+        books = []
+        for url in self.page_urls(userId):
+            books.extend(((shelfFetchState.get(url) or {}).get("books") or {}).values())
         return books
+
+    async def fetch(self, userId):
+        return (await fetch_all_pages(userId))._replace(source=self.name)
+
+# The list_rss feed is a fraction of the size of the HTML list but has no start dates and spells authors
+# "First Last" instead of "Last, First", so books already known from the HTML list lend theirs to keep keys stable
+class RssShelfSource:
+    name = "rss"
+
+    def page_url(self, userId, page=1):
+        return f"{goodreadsBaseUrl}/review/list_rss/{userId}?shelf=currently-reading"
+
+    def page_urls(self, userId):
+        return [self.page_url(userId)]
+
+    async def fetch(self, userId, knownBooks=None):
+        url = self.page_url(userId)
+        state = get_fetch_state(url)
+        # Other accounts (batch mode) aren't in shelfStore, so they borrow from their own HTML list
+        if knownBooks is None:
+            knownBooks = shelfStore if userId == goodreadsUserId else htmlShelfSource.known_books(userId)
+        await hostRateLimiter.acquire(url)
+        async with get_http_session().get(url, headers=conditional_headers(state)) as response:
+            metrics.increment("fetch_requests")
+            if response.status == 304 and state["books"] is not None:
+                log("Shelf feed not modified (304), reusing parsed books.", LOG_DEBUG)
+                metrics.increment("shelf_revalidated")
+                return ShelfFetchResult(state["books"], False, source=self.name)
+            if response.status != 200:
+                log(f"Failed to fetch Goodreads feed: {response.status}", LOG_ERROR)
+                metrics.increment("fetch_errors")
+                retryAfter = parse_retry_after(response.headers.get("Retry-After"))
+                hostRateLimiter.hold(url, retryAfter)
+                return ShelfFetchResult(None, False, retryAfter, self.name)
+            reader = RssItemReader(state)
+            with metrics.timer("parse_seconds"):
+                async for chunk in read_body(response, 8192):
+                    reader.feed(chunk)
+                books = reader.close()
+        metrics.increment("shelf_parsed")
+        if not books:
+            log("No items found in shelf feed, the shelf is empty.", LOG_DEBUG)
+        books = adopt_known_details(books, knownBooks)
+        state["etag"] = response.headers.get("ETag")
+        state["lastModified"] = response.headers.get("Last-Modified")
+        state["pageCount"] = 1
+        if books == state["books"]:
+            metrics.increment("shelf_revalidated")
+            return ShelfFetchResult(state["books"], False, source=self.name)
+        state["books"] = books
+        return ShelfFetchResult(books, True, source=self.name)
+
+# Items are built as soon as their closing tag arrives, so the feed is never held in memory as a whole.
+# Items whose fields match one seen on the previous fetch reuse that Book
+class RssItemReader:
+    def __init__(self, state=None):
+        from xml.etree.ElementTree import XMLPullParser
+        self.parser = XMLPullParser(events=("end",))
+        self.state = state
+        self.previous = (state or {}).get("rowBooks") or {}
+        self.rowBooks = {}
+        self.books = []
+
+    def feed(self, chunk):
+        self.parser.feed(chunk)
+        self.read_items()
+
+    def read_items(self):
+        for _, element in self.parser.read_events():
+            if element.tag != "item":
+                continue
+            fields = {child.tag: (child.text or "").strip() for child in element}
+            element.clear()
+            fingerprint = (
+                fields.get("isbn"),
+                fields.get("title", ""),
+                fields.get("author_name", ""),
+                fields.get("book_large_image_url") or fields.get("book_image_url"),
+            )
+            book = self.previous.get(fingerprint) or self.rowBooks.get(fingerprint)
+            if book is None:
+                book = Book.create(*fingerprint, None)
+                metrics.increment("rows_parsed")
+            else:
+                metrics.increment("rows_reused")
+            self.rowBooks[fingerprint] = book
+            self.books.append(book)
+
+    def close(self):
+        self.parser.close()
+        self.read_items()
+        if self.state is not None:
+            self.state["rowBooks"] = self.rowBooks
+        log(f"Found {len(self.books)} feed item(s).", LOG_DEBUG)
+        return self.books
+
+def adopt_known_details(books, knownBooks):
+    known = {(book.isbn, book.title.casefold()): book for book in knownBooks}
+    adopted = {}
+    for book in books:
+        match = known.get((book.isbn, book.title.casefold()))
+        if match is not None:
+            book = Book.create(book.isbn, book.title, match.author, book.cover, book.startDate or match.startDate)
+        adopted[book.key] = book
+    return adopted
+
+# Fetches both sources every probeEvery cycles and uses RSS in between only if it returned exactly the
+# books the HTML list did and answered faster; the HTML result is what a probe cycle reports
+class AutoShelfSource:
+    name = "auto"
+    probeEvery = 30
+
+    def __init__(self, html, rss):
+        self.html = html
+        self.rss = rss
+        self.active = None
+        self.cyclesSinceProbe = 0
+
+    async def fetch(self, userId):
+        if self.active is None or self.cyclesSinceProbe >= self.probeEvery:
+            result = await self.probe(userId)
+        else:
+            self.cyclesSinceProbe += 1
+            try:
+                result = await self.active.fetch(userId)
+            except Exception:
+                self.active = None
+                raise
+            # A failing source is re-probed next cycle instead of being trusted until the next scheduled probe
+            if result.books is None:
+                self.active = None
+        return result
+
+    async def probe(self, userId):
+        startedAt = time.monotonic()
+        htmlResult = await self.html.fetch(userId)
+        htmlSeconds = time.monotonic() - startedAt
+        if htmlResult.books is None:
+            return htmlResult
+        startedAt = time.monotonic()
+        try:
+            rssResult = await self.rss.fetch(userId, htmlResult.books.values())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            metrics.increment("fetch_errors")
+            log(f"Shelf feed probe failed: {e!r}", LOG_WARNING)
+            rssResult = ShelfFetchResult(None, False, source=self.rss.name)
+        rssSeconds = time.monotonic() - startedAt
+        complete = rssResult.books is not None and rssResult.books.keys() == htmlResult.books.keys()
+        self.active = self.rss if complete and rssSeconds < htmlSeconds else self.html
+        self.cyclesSinceProbe = 0
+        metrics.set_gauge("shelf_source_rss", 1 if self.active is self.rss else 0)
+        log(f"Shelf source probe: html {htmlSeconds * 1000:.0f} ms, rss {rssSeconds * 1000:.0f} ms ({'complete' if complete else 'incomplete'}), using {self.active.name}.")
+        return htmlResult
+
+htmlShelfSource = HtmlShelfSource()
+rssShelfSource = RssShelfSource()
+shelfSources = {
+    "html": htmlShelfSource,
+    "rss": rssShelfSource,
+    "auto": AutoShelfSource(htmlShelfSource, rssShelfSource),
+}
+
+def get_shelf_source():
+    name = configStore.get("shelfSource", "auto")
+    if name not in shelfSources:
+        log(f"Unknown shelfSource '{name}', using html.", LOG_WARNING)
+        return htmlShelfSource
+    return shelfSources[name]
+
+# changed is False when the shelf was revalidated as identical; retryAfter comes from a 429/503.
+# A changed shelf is snapshotted to cacheFile unless it is None
+async def fetch_currently_reading(userId, source=None, cacheFile=shelfCacheFile):
+    try:
+        result = await (source or get_shelf_source()).fetch(userId)
+        if result.changed and cacheFile:
+            save_shelf_cache(userId, shelfSources[result.source], cacheFile)
+        return result
     except Exception as e:
-        log(f"Error in Goodreads getter: {e}")
-        return None
+        # Timeouts, DNS failures and refused connections land here rather than as a status code
+        metrics.increment("fetch_errors")
+        log(f"Error in Goodreads getter: {e!r}", LOG_ERROR)
+        return ShelfFetchResult(None, False)
 
-# === Presence Loop ===
-def presence_loop():
-    global discordAppId, goodreadsUserId
-    rpc = Presence(discordAppId)
+async def get_currently_reading(userId):
+    return (await fetch_currently_reading(userId)).books
+
+# === Shelf Cache ===
+# Snapshot of the last parsed shelf so startup can show a book before the network answers
+shelfCacheVersion = 2
+
+def save_shelf_cache(userId, source, path=shelfCacheFile):
+    pages = []
+    for url in source.page_urls(userId):
+        state = shelfFetchState.get(url)
+        if not state or state["books"] is None:
+            return
+        pages.append({
+            "etag": state["etag"],
+            "lastModified": state["lastModified"],
+            "tableHash": state["tableHash"],
+            "books": [book.to_row() for book in state["books"].values()],
+        })
+    snapshot = {
+        "version": shelfCacheVersion,
+        "userId": userId,
+        "source": source.name,
+        "url": source.page_url(userId),
+        "savedAt": time.time(),
+        "pages": pages,
+    }
     try:
-        rpc.connect()
+        write_json_atomic(path, snapshot)
+        log(f"Shelf cache saved with {sum(len(page['books']) for page in pages)} book(s).", LOG_DEBUG)
     except Exception as e:
-        log(f"Failed to connect to Discord RPC: {e}")
-        return
+        log(f"Failed to save shelf cache: {e}", LOG_ERROR)
 
-    while True:
-        if not trayQuitEvent.is_set():
-            if loopShouldRunEvent.is_set():
-                global title, author, cover, start, currentISBN
-                data = get_currently_reading(goodreadsUserId)
-                if data:
-                    if currentISBN in data:
-                        currentBook["isbn"], currentBook["title"], currentBook["author"], currentBook["cover"], currentBook["start"] = data[currentISBN][0:5]
-                        log(f"Current book: {currentBook['title']} by {currentBook['author']}")
-                    else:
-                        default_isbn = list(data.keys())[0]
-                        save_new_isbn(default_isbn)
-                        currentBook["isbn"], currentBook["title"], currentBook["author"], currentBook["cover"], currentBook["start"] = data[default_isbn][0:5]
-                        log(f"Default book set: {currentBook['title']} by {currentBook['author']}")
-                else:
-                    log("[Error] Could not retrieve currently reading books.")
-                    time.sleep(10)
-                    continue
-                if currentBook["title"] and currentBook["author"]:
-                    try:
-                        rpc.update(
-                            details=currentBook["title"],
-                            state=f"by {currentBook['author'] if currentBook['author'] else 'Unknown Author'}",
-                            large_image=currentBook["cover"] or "https://i.gr-assets.com/images/S/compressed.photo.goodreads.com/nophoto/book/111x148._SX50_.png",
-                            large_text="Reading via Goodreads",
-                            start=int(time.mktime(time.strptime(currentBook["start"], "%b %d, %Y"))) if currentBook["start"] else None,
-                            buttons=[{
-                                "label": "View Goodreads",
-                                "url": f"https://www.goodreads.com/review/list/{goodreadsUserId}?shelf=currently-reading"
-                            }]
-                        )
-                        log(f"[Updated] {currentBook['title']} by {currentBook['author']}")
-                    except Exception as e:
-                        errorMessage = str(e).lower()
-                        if "pipe" in errorMessage or "closed" in errorMessage or isinstance(e, (ConnectionResetError, BrokenPipeError, OSError)):
-                            log(f"RPC connection lost or pipe closed: {e}, attempting reconnect.")
-                            try:
-                                rpc.close()
-                            except Exception:
-                                pass
-                            try:
-                                rpc = Presence(discordAppId)
-                                rpc.connect()
-                                log("Reconnected to Discord RPC.")
-                                rpc.update(
-                                    details=currentBook["title"],
-                                    state=f"by {currentBook['author'] if currentBook['author'] else 'Unknown Author'}",
-                                    large_image=currentBook["cover"] or "https://i.gr-assets.com/images/S/compressed.photo.goodreads.com/nophoto/book/111x148._SX50_.png",
-                                    large_text="Reading via Goodreads",
-                                    start=int(time.mktime(time.strptime(currentBook["start"], "%b %d, %Y"))) if currentBook["start"] else None,
-                                    buttons=[{
-                                        "label": "View Goodreads",
-                                        "url": f"https://www.goodreads.com/review/list/{goodreadsUserId}?shelf=currently-reading"
-                                    }]
-                                )
-                            except Exception as reconnectError:
-                                log(f"Reconnection failed: {reconnectError}")
-                                time.sleep(10)
-                                continue
-                        else:
-                            log(f"Unexpected RPC update error: {e}")
+# Seeds the fetch state from the cache so the first request revalidates instead of refetching
+def load_shelf_cache(userId, path=shelfCacheFile):
+    try:
+        with open(path, "r") as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log(f"Ignoring unreadable shelf cache: {e}", LOG_WARNING)
+        return None
+    # Version 2 snapshots predate shelf sources and always came from the HTML list
+    source = shelfSources.get(snapshot.get("source", "html"))
+    if source is None or snapshot.get("version") != shelfCacheVersion or snapshot.get("userId") != userId or snapshot.get("url") != source.page_url(userId):
+        log("Shelf cache belongs to another user or version, ignoring it.", LOG_DEBUG)
+        return None
+    pages = snapshot.get("pages") or []
+    books = {}
+    for page, pageSnapshot in enumerate(pages, start=1):
+        pageBooks = {book.key: book for book in map(Book.from_row, pageSnapshot.get("books") or [])}
+        if not pageBooks:
+            return None
+        shelfFetchState[source.page_url(userId, page)] = {
+            "etag": pageSnapshot.get("etag"),
+            "lastModified": pageSnapshot.get("lastModified"),
+            "tableHash": pageSnapshot.get("tableHash"),
+            "books": pageBooks,
+            "pageCount": len(pages),
+            "mergedPageCount": len(pages),
+        }
+        books.update(pageBooks)
+    if not books:
+        return None
+    metrics.increment("disk_cache_loads")
+    ageMinutes = (time.time() - snapshot.get("savedAt", time.time())) / 60
+    log(f"Loaded {len(books)} cached book(s) saved {ageMinutes:.0f} minute(s) ago.")
+    return books
 
-                else:
-                    log("[Error] Could not retrieve current book.")
-                    time.sleep(10)
-                    continue
+# === Refresh Policy ===
+# Polls faster right after the shelf changes, backs off while it stays the same,
+# and retries failures with capped exponential backoff plus jitter
+class RefreshPolicy:
+    minInterval = 30
+    # Floor for a zero, negative or tiny refreshInterval so a bad setting can't refetch back-to-back
+    minBaseInterval = 1
+    stableFactors = (0.25, 0.5, 1, 2, 4)
+    backoffBase = 10
+    backoffCap = 15 * 60
+    jitter = 0.1
+
+    def __init__(self):
+        self.failures = 0
+        self.stableCycles = len(self.stableFactors) // 2
+        self.hasBaseline = False
+
+    def interval(self, baseInterval):
+        factor = self.stableFactors[min(self.stableCycles, len(self.stableFactors) - 1)]
+        baseInterval = max(baseInterval, self.minBaseInterval)
+        interval = max(min(baseInterval, self.minInterval), baseInterval * factor)
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def on_success(self, changed, baseInterval):
+        self.failures = 0
+        if not self.hasBaseline:
+            self.hasBaseline = True
+        elif changed:
+            self.stableCycles = 0
+        else:
+            self.stableCycles += 1
+        return self.interval(baseInterval)
+
+    def on_failure(self, retryAfter=None):
+        self.failures += 1
+        ceiling = min(self.backoffCap, self.backoffBase * 2 ** (self.failures - 1))
+        delay = random.uniform(self.backoffBase, max(self.backoffBase, ceiling))
+        if retryAfter is not None:
+            delay = max(delay, retryAfter)
+        log(f"Backing off {delay:.0f}s after {self.failures} consecutive failure(s).", LOG_WARNING)
+        return delay
+
+    def reset(self):
+        self.__init__()
+
+# === Presence Payloads ===
+defaultCoverUrl = "https://i.gr-assets.com/images/S/compressed.photo.goodreads.com/nophoto/book/111x148._SX50_.png"
+# Discord drops SET_ACTIVITY calls sent faster than once every 15 seconds
+presenceRateLimitSeconds = 15
+
+class PresencePayload(NamedTuple):
+    key: str
+    details: str
+    state: str
+    largeImage: str
+    largeText: str
+    start: Optional[int]
+    buttonUrl: str
+
+    def as_update_kwargs(self):
+        return {
+            "details": self.details,
+            "state": self.state,
+            "large_image": self.largeImage,
+            "large_text": self.largeText,
+            "start": self.start,
+            "buttons": [{"label": "View Goodreads", "url": self.buttonUrl}],
+        }
+
+@functools.lru_cache(maxsize=64)
+def build_presence_payload(book, userId):
+    return PresencePayload(
+        key=book.key,
+        details=book.title,
+        state=f"by {book.author if book.author else 'Unknown Author'}",
+        largeImage=book.cover or defaultCoverUrl,
+        largeText="Reading via Goodreads",
+        start=book.startTimestamp,
+        buttonUrl=get_shelf_url(userId),
+    )
+
+class PresenceCoalescer:
+    def __init__(self, minInterval=presenceRateLimitSeconds):
+        self.minInterval = minInterval
+        self.lastSent = None
+        self.lastSentAt = None
+        self.pending = None
+
+    async def submit(self, rpc, payload):
+        if payload == self.lastSent:
+            self.pending = None
+            log("Presence payload unchanged, skipping update.", LOG_DEBUG)
+            return False
+        self.pending = payload
+        return await self.flush(rpc)
+
+    # Seconds until the pending payload may be sent, or None when nothing is pending
+    def delay(self):
+        if self.pending is None:
+            return None
+        if self.lastSentAt is None:
+            return 0
+        return max(0, self.lastSentAt + self.minInterval - time.monotonic())
+
+    async def flush(self, rpc):
+        wait = self.delay()
+        if wait is None:
+            return False
+        if wait > 0:
+            log(f"Presence update deferred {wait:.1f}s for Discord rate limit.", LOG_DEBUG)
+            return False
+        payload = self.pending
+        with metrics.timer("rpc_update_seconds"):
+            await rpc.update(**payload.as_update_kwargs())
+        metrics.increment("presence_updates")
+        metrics.set_gauge("last_presence_update_timestamp", time.time())
+        self.lastSent = payload
+        self.lastSentAt = time.monotonic()
+        self.pending = None
+        log(f"[Updated] {payload.details} {payload.state}")
+        return True
+
+    # Queue the last acknowledged payload again, e.g. after reconnecting
+    def reset(self):
+        if self.pending is None:
+            self.pending = self.lastSent
+        self.lastSent = None
+
+    def clear(self):
+        self.lastSent = None
+        self.pending = None
+
+# === Discord Connection ===
+# Owns the pypresence client as a task on the runtime loop: connects lazily once there is something to show,
+# reconnects with capped backoff, and resends the last payload after a reconnect.
+# Callers on any thread only hand over the payload they want shown, so a slow Discord never blocks fetching.
+class DiscordConnection:
+    reconnectBase = 5
+    reconnectCap = 5 * 60
+    # An unchanged payload is re-sent at most this often to check the pipe is still alive
+    healthCheckInterval = 10 * 60
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.signal = LoopSignal()
+        self.appId = None
+        self.appIdChanged = False
+        self.desired = None
+        self.clearRequested = False
+        self.healthCheckDue = False
+        self.stopping = False
+        self.task = None
+        # Only touched by the connection task
+        self.rpc = None
+        self.coalescer = PresenceCoalescer()
+        self.rejected = None
+        self.failures = 0
+        self.nextConnectAt = 0
+        self.lastHealthyAt = None
+
+    # Called on the runtime loop
+    def start(self, appId):
+        with self.lock:
+            self.appId = appId
+            self.stopping = False
+        if self.task is None:
+            self.signal.bind()
+            self.task = asyncio.get_running_loop().create_task(self.run(), name="discord-rpc")
+
+    def set_app_id(self, appId):
+        with self.lock:
+            if appId == self.appId:
+                return
+            self.appId = appId
+            self.appIdChanged = True
+        self.signal.set()
+
+    def set_presence(self, payload):
+        with self.lock:
+            if payload == self.desired and self.lastHealthyAt is not None and time.monotonic() - self.lastHealthyAt >= self.healthCheckInterval:
+                self.healthCheckDue = True
+            self.desired = payload
+            self.clearRequested = False
+        self.signal.set()
+
+    def clear_presence(self):
+        with self.lock:
+            self.desired = None
+            self.clearRequested = True
+        self.signal.set()
+
+    async def stop(self):
+        with self.lock:
+            self.stopping = True
+        self.signal.set()
+        if self.task is not None:
+            try:
+                await asyncio.wait_for(self.task, 5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            self.task = None
+        self.close_rpc()
+
+    @property
+    def connected(self):
+        return self.rpc is not None
+
+    # AioPresence.close() also closes the event loop it runs on, so say goodbye and drop the socket directly
+    def close_rpc(self):
+        if self.rpc is None:
+            return
+        try:
+            self.rpc.send_data(2, {"v": 1, "client_id": self.rpc.client_id})
+            self.rpc.sock_writer.close()
+        except Exception:
+            pass
+        self.rpc = None
+        self.coalescer.reset()
+
+    async def connect(self, appId):
+        try:
+            rpc = AioPresence(appId)
+            await rpc.connect()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failures += 1
+            delay = random.uniform(self.reconnectBase, min(self.reconnectCap, self.reconnectBase * 2 ** self.failures))
+            self.nextConnectAt = time.monotonic() + delay
+            log(f"Failed to connect to Discord RPC: {e}; retrying in {delay:.0f}s.", LOG_ERROR if self.failures == 1 else LOG_WARNING)
+            return
+        if self.failures or self.coalescer.lastSentAt is not None:
+            metrics.increment("rpc_reconnects")
+            log("Reconnected to Discord RPC.")
+        else:
+            log("Connected to Discord RPC.")
+        self.rpc = rpc
+        self.failures = 0
+        self.lastHealthyAt = time.monotonic()
+
+    # Runs one IPC call; a broken pipe drops the client so the next pass reconnects and resends
+    async def call(self, action, payload=None):
+        try:
+            if action == "clear":
+                await self.rpc.clear()
+                self.coalescer.clear()
+                log("Presence cleared due to loop not running.")
             else:
-                try:
-                    rpc.clear()
-                    log("Presence cleared due to loop not running.")
-                except Exception as e:
-                    pass
-                log("Presence loop paused.")
-                time.sleep(10)
-                continue
-            for _ in range(refreshInterval):
-                time.sleep(1)
-                if (not loopShouldRunEvent.is_set() and not stayRunningAfterGUIEvent.is_set()) or trayQuitEvent.is_set():
+                await self.coalescer.flush(self.rpc)
+            self.lastHealthyAt = time.monotonic()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if is_rpc_connection_error(e):
+                log(f"RPC connection lost or pipe closed: {e}, attempting reconnect.", LOG_WARNING)
+                self.close_rpc()
+                self.nextConnectAt = 0
+            else:
+                log(f"Unexpected RPC update error: {e}", LOG_ERROR)
+                self.coalescer.pending = None
+                self.rejected = payload
+
+    # Picks the next action under the lock, then awaits IPC or the next signal outside it
+    async def run(self):
+        while True:
+            wait = None
+            action = None
+            with self.lock:
+                if self.stopping:
                     break
+                payload = self.desired
+                if self.appIdChanged:
+                    self.appIdChanged = False
+                    action = "reconnect"
+                elif self.clearRequested:
+                    self.clearRequested = False
+                    action = "clear"
+                elif payload is None or payload == self.rejected:
+                    pass
+                elif self.rpc is None:
+                    wait = self.nextConnectAt - time.monotonic()
+                    if wait <= 0:
+                        action = "connect"
+                else:
+                    if self.healthCheckDue:
+                        self.healthCheckDue = False
+                        log("Re-sending presence as a connection health check.", LOG_DEBUG)
+                        self.coalescer.reset()
+                    if payload != self.coalescer.lastSent:
+                        self.coalescer.pending = payload
+                    wait = self.coalescer.delay()
+                    if wait is not None and wait <= 0:
+                        action = "flush"
+                appId = self.appId
+            if action is None:
+                await self.signal.wait(wait)
+            elif action == "reconnect":
+                self.close_rpc()
+                self.failures = 0
+                self.nextConnectAt = 0
+            elif action == "clear":
+                if self.rpc is not None:
+                    await self.call("clear")
+                else:
+                    self.coalescer.clear()
+            elif action == "connect":
+                await self.connect(appId)
+            else:
+                await self.call("flush", payload)
+        self.close_rpc()
+
+discordConnection = DiscordConnection()
+
+# === Book Rotation ===
+# Cycles presence through the shelf, or the books listed in rotationBooks, without touching currentISBN.
+# Payloads are built once per shelf change, the dwell never drops below Discord's rate limit so every step
+# costs exactly one SET_ACTIVITY, and a step that falls close to a refresh moves onto it so one wake does both
+rotationAlignSeconds = 5
+
+class BookRotation:
+    def __init__(self):
+        self.books = []
+        self.payloads = []
+        self.index = 0
+        self.nextAt = None
+        self.showCurrent = True
+
+    @property
+    def enabled(self):
+        return bool(configStore.get("rotationEnabled"))
+
+    def dwell(self):
+        try:
+            dwell = float(configStore.get("rotationDwell") or 0)
+        except (TypeError, ValueError):
+            log("Ignoring non-numeric rotationDwell.", LOG_WARNING)
+            dwell = 0
+        return max(presenceRateLimitSeconds, dwell)
+
+    # Keeps the book on display in place when it is still part of the rotation
+    def rebuild(self, userId):
+        current = self.books[self.index].key if self.books else None
+        wanted = {book.key for book in map(shelfStore.get, configStore.get("rotationBooks") or []) if book is not None}
+        self.books = [book for book in shelfStore if not wanted or book.key in wanted]
+        self.payloads = [build_presence_payload(book, userId) for book in self.books]
+        keys = [book.key for book in self.books]
+        if current in keys:
+            self.index = keys.index(current)
         else:
-            # close gui and exit loop
-            log("Loop should not run, exiting presence loop.")
-            log("Exiting presence loop due to tray quit event.")
-            rpc.close()
-            break
+            self.index = 0
+            self.showCurrent = True
+        log(f"Rotation covers {len(self.books)} book(s).", LOG_DEBUG)
+
+    def due(self, now):
+        if not self.books:
+            return False
+        return self.showCurrent or self.nextAt is None or now >= self.nextAt
+
+    def wake_at(self):
+        if not self.books:
+            return None
+        return 0 if self.showCurrent else self.nextAt
+
+    def step(self, now, nextFetchAt):
+        if self.showCurrent:
+            self.showCurrent = False
+        else:
+            self.index = (self.index + 1) % len(self.books)
+        dwell = self.dwell()
+        nextAt = now + dwell
+        if abs(nextFetchAt - nextAt) <= min(rotationAlignSeconds, dwell / 4):
+            nextAt = max(nextFetchAt, now + presenceRateLimitSeconds)
+        self.nextAt = nextAt
+        metrics.increment("rotation_steps")
+        return self.books[self.index], self.payloads[self.index]
+
+# === Presence Loop ===
+def select_current_book():
+    book = shelfStore.get(currentISBN)
+    if book is None:
+        book = shelfStore.first()
+        save_new_isbn(book.key)
+        log(f"Default book set: {book.title} by {book.author}")
+    return book
+
+# The shelf feed spells authors "First Last" and the HTML list "Last, First", so a book without an ISBN that
+# moves between sources is re-keyed with a different author and only its title still matches
+def find_rekeyed_book(selected, candidates):
+    candidates = list(candidates)
+    book = next((candidate for candidate in candidates if candidate.titleAuthorKey == selected.titleAuthorKey), None)
+    if book is None and selected.isbn is None:
+        title = selected.title.casefold()
+        book = next((candidate for candidate in candidates if candidate.isbn is None and candidate.title.casefold() == title), None)
+    return book
+
+# Keeps currentISBN pointing at a book on the shelf: a selected book that was re-keyed (for example a
+# no-ISBN row that gained an ISBN) follows its new key, one that left the shelf falls back to the first book
+def on_shelf_changed(delta):
+    metrics.increment("shelf_books_added", len(delta.added))
+    metrics.increment("shelf_books_removed", len(delta.removed))
+    metrics.increment("shelf_books_modified", len(delta.modified))
+    log(f"Shelf changed: {len(delta.added)} added, {len(delta.removed)} removed, {len(delta.modified)} modified.", LOG_DEBUG)
+    if currentISBN is None or shelfStore.get(currentISBN) is None:
+        selected = delta.removed.get(currentISBN)
+        book = None
+        if selected is not None:
+            book = find_rekeyed_book(selected, delta.added.values())
+        if book is not None:
+            log(f"Selected book is now keyed {book.key}.")
+        else:
+            book = shelfStore.first()
+            if book is not None:
+                log(f"Selected book left the shelf, switching to {book.title} by {book.author}." if selected else f"Default book set: {book.title} by {book.author}")
+        if book is not None:
+            save_new_isbn(book.key)
+    publish_state(labels=shelfStore.labels)
+
+def is_rpc_connection_error(e):
+    errorMessage = str(e).lower()
+    return "pipe" in errorMessage or "closed" in errorMessage or isinstance(e, (ConnectionResetError, BrokenPipeError, OSError))
+
+async def presence_loop():
+    global discordAppId, goodreadsUserId
+    discordConnection.start(discordAppId)
+
+    book = None
+    refreshPolicy = RefreshPolicy()
+    rotation = BookRotation()
+    nextFetchAt = 0
+    lastFetchAt = None
+    paused = False
+
+    def show_book(book, payload=None):
+        if book.title and book.author:
+            discordConnection.set_presence(payload or build_presence_payload(book, goodreadsUserId))
+            publish_state(book=book, paused=False)
+            return True
+        log("[Error] Could not retrieve current book.", LOG_ERROR)
+        return False
+
+    # Show the cached shelf right away; the first fetch below only revalidates it
+    if len(shelfStore):
+        rotation.rebuild(goodreadsUserId)
+        if not rotation.enabled:
+            book = select_current_book()
+            show_book(book)
+
+    while not trayQuitEvent.is_set():
+        if not loopShouldRunEvent.is_set():
+            if not paused:
+                discordConnection.clear_presence()
+                publish_state(paused=True)
+                log("Presence loop paused.")
+                paused = True
+            # Nothing to do until the GUI, tray or config wakes us
+            await presenceScheduler.wait()
+            nextFetchAt = 0
+            rotation.showCurrent = True
+            continue
+        paused = False
+
+        now = time.monotonic()
+        if now >= nextFetchAt:
+            result = await fetch_currently_reading(goodreadsUserId)
+            lastFetchAt = now
+            if result.books is not None:
+                metrics.set_gauge("last_fetch_success_timestamp", time.time())
+                metrics.set_gauge("shelf_books", len(result.books))
+                publish_state(shelfStatus="ready" if result.books else "empty")
+                # Revalidation state is per URL, so an unchanged fetch can still follow a switch of user or
+                # source; replacing every time keeps the store on this shelf and is a no-op when nothing differs
+                delta = shelfStore.replace(result.books.values())
+                # The delta, not result.changed, is what the shelf did: an auto source switching between html
+                # and rss reports changed for the same books
+                nextFetchAt = now + refreshPolicy.on_success(not delta.empty, refreshInterval)
+                if not delta.empty:
+                    rotation.rebuild(goodreadsUserId)
+                if not len(shelfStore):
+                    # Finishing the last book empties the shelf; whatever was on Discord goes with it
+                    if book is not None or not delta.empty:
+                        log("Currently-reading shelf is empty, clearing presence.")
+                        discordConnection.clear_presence()
+                        publish_state(book=None)
+                    book = None
+                elif not rotation.enabled:
+                    previousBook = book
+                    book = select_current_book()
+                    if not delta.empty and book != previousBook:
+                        log(f"Current book: {book.title} by {book.author}")
+                    if not show_book(book):
+                        nextFetchAt = now + refreshPolicy.on_failure()
+            else:
+                log("[Error] Could not retrieve currently reading books.", LOG_ERROR)
+                publish_state(shelfStatus="failed")
+                nextFetchAt = now + refreshPolicy.on_failure(result.retryAfter)
+        elif not rotation.enabled and len(shelfStore) and (book is None or currentISBN in shelfStore and shelfStore.get(currentISBN) != book):
+            # Book switches from the GUI; the connection collapses bursts into one rate-limited update
+            book = select_current_book()
+            show_book(book)
+        if rotation.enabled and rotation.due(now):
+            book, payload = rotation.step(now, nextFetchAt)
+            log(f"Rotating to {book.title} by {book.author}.", LOG_DEBUG)
+            show_book(book, payload)
+
+        if configStore.get("metricsStatusFile"):
+            write_status_file()
+        log_memory_snapshot()
+
+        wakeAt = nextFetchAt
+        if rotation.enabled and rotation.wake_at() is not None:
+            wakeAt = min(wakeAt, rotation.wake_at())
+        reasons = await presenceScheduler.wait(max(0, wakeAt - time.monotonic()))
+        if "rotation" in reasons:
+            rotation.rebuild(goodreadsUserId)
+            rotation.showCurrent = True
+            # Falls back to the pinned book on the next pass when rotation was just turned off
+            book = None
+        if "user" in reasons or "source" in reasons:
+            refreshPolicy.reset()
+            nextFetchAt = 0
+        elif "refresh" in reasons:
+            nextFetchAt = 0
+        elif "interval" in reasons and lastFetchAt is not None and refreshPolicy.failures == 0:
+            nextFetchAt = lastFetchAt + refreshPolicy.interval(refreshInterval)
+
+    log("Exiting presence loop due to tray quit event.")
+
+# === Presence Runtime ===
+# Fetching, parsing and Discord IPC all run as tasks on one asyncio loop. Tk and the tray never touch its
+# objects: they wake it through presenceScheduler and ConfigStore and read what it shows from appState
+runtimeLoop = None
+runtimeTask = None
+
+# Runs on the runtime thread so the window never waits for the disk cache, let alone Goodreads
+def load_cached_shelf():
+    cachedBooks = load_shelf_cache(goodreadsUserId)
+    if not cachedBooks:
+        log("No cached shelf yet, the first fetch will run in the background.")
+        return
+    shelfStore.replace(cachedBooks.values())
+    publish_state(shelfStatus="cached")
+    book = shelfStore.get(currentISBN) or shelfStore.first()
+    log(f"Current book: {book.title} by {book.author}")
+
+async def run_presence_runtime():
+    global runtimeLoop, runtimeTask
+    runtimeLoop = asyncio.get_running_loop()
+    runtimeTask = asyncio.current_task()
+    presenceScheduler.bind()
+    if not len(shelfStore):
+        load_cached_shelf()
+    try:
+        await presence_loop()
+    except asyncio.CancelledError:
+        log("Presence runtime cancelled.")
+    finally:
+        await discordConnection.stop()
+        await close_http_session()
+        runtimeLoop = runtimeTask = None
+
+def run_presence():
+    asyncio.run(run_presence_runtime())
+
+# Safe from any thread; cancels whatever the runtime is awaiting instead of waiting for it to time out
+def stop_presence_runtime():
+    trayQuitEvent.set()
+    presenceScheduler.wake("quit")
+    loop, task = runtimeLoop, runtimeTask
+    if loop is not None and task is not None:
+        try:
+            loop.call_soon_threadsafe(task.cancel)
+        except RuntimeError:
+            pass
 
 # === Save New ISBN Function ===
 def save_new_isbn(isbn):
-    global currentISBN
-    currentISBN = isbn
-    with open(configFile, "r+") as f:
-        configData = json.load(f)
-        configData["currentISBN"] = currentISBN
-        f.seek(0)
-        json.dump(configData, f, indent=4)
-        f.truncate()
-    log(f"New ISBN saved: {currentISBN}")
+    if configStore.update(currentISBN=isbn):
+        log(f"New ISBN saved: {isbn}")
 
 # === GUI ===
+shelfStatusMessages = {
+    "loading": "Loading your shelf from Goodreads...",
+    "cached": "Showing your saved shelf while it refreshes.",
+    "empty": "Your currently-reading shelf is empty.",
+    "failed": "Couldn't reach Goodreads, retrying.",
+}
+
 def launch_gui():
+    import tkinter as tk
+    from tkinter import ttk
     global discordAppId, goodreadsUserId, refreshInterval, minimizeToTray, StartOnStartup
 
     def save_config():
-        global discordAppId, goodreadsUserId, refreshInterval, minimizeToTray, StartOnStartup, currentISBN, currentBook
         configData = {
             "discordAppId": discordAppIdVar.get(),
             "goodreadsUserId": goodreadsUserIdVar.get(),
             "keepRunning": keepRunningVar.get(),
             "minimizeToTray": minimizeToTrayVar.get(),
             "startOnStartup": startOnStartupVar.get(),
-            "refreshInterval": refreshIntervalVar.get(),
-            "currentISBN": currentBookVar.get().split(" -- ")[-1] if currentBookVar.get() != "None" else None
+            "rotationEnabled": rotationEnabledVar.get(),
+            "currentISBN": appState.labels.get(currentBookVar.get(), currentISBN)
         }
-        with open(configFile, "w") as f:
-            json.dump(configData, f, indent=4)
-        discordAppId = configData["discordAppId"]
-        goodreadsUserId = configData["goodreadsUserId"]
-        refreshInterval = configData["refreshInterval"]
-        minimizeToTray = configData["minimizeToTray"]
-        StartOnStartup = configData["startOnStartup"]
-        currentISBN = configData["currentISBN"]
-        currentBook = books.get(currentISBN, {"isbn": None, "title": None, "author": None, "cover": None, "start": None})
-        set_startup_enabled()
-        if keepRunningVar.get():
-            stayRunningAfterGUIEvent.set()
-        else:
-            stayRunningAfterGUIEvent.clear()
+        try:
+            configData["refreshInterval"] = refreshIntervalVar.get()
+        except tk.TclError:
+            log("Ignoring non-numeric refresh interval.", LOG_WARNING)
+        try:
+            configData["rotationDwell"] = rotationDwellVar.get()
+        except tk.TclError:
+            log("Ignoring non-numeric rotation dwell.", LOG_WARNING)
+        configStore.update(**configData)
 
     def on_close():
         log(f"GUI closed. stayRunningAfterGUIEvent: {stayRunningAfterGUIEvent.is_set()}")
         if not stayRunningAfterGUIEvent.is_set():
             loopShouldRunEvent.clear()
+            presenceScheduler.wake("pause")
         if minimizeToTray:
             log("Minimizing to tray.")
             root.withdraw()
         else:
             log("Closing GUI and exiting.")
-            root.destroy()
+            destroy_gui()
 
     global root
     root = tk.Tk()
@@ -367,8 +2005,11 @@ def launch_gui():
     keepRunningVar = tk.BooleanVar(value=stayRunningAfterGUIEvent.is_set())
     refreshIntervalVar = tk.IntVar(value=refreshInterval)
     minimizeToTrayVar = tk.BooleanVar(value=minimizeToTray)
-    startOnStartupVar = tk.BooleanVar(value=config.get("startOnStartup", False))
-    currentBookVar = tk.StringVar(value=str(books[currentISBN][1]) + " -- " + str(currentISBN) if currentISBN else "None")
+    startOnStartupVar = tk.BooleanVar(value=StartOnStartup)
+    rotationEnabledVar = tk.BooleanVar(value=bool(configStore.get("rotationEnabled")))
+    rotationDwellVar = tk.IntVar(value=configStore.get("rotationDwell", 60))
+    currentBookVar = tk.StringVar()
+    shelfStatusVar = tk.StringVar()
 
     ttk.Label(root, text="Discord App ID (Enter to Save):").grid(row=0, column=0, padx=10, pady=5, sticky="w")
     discordAppIdEntry = ttk.Entry(root, textvariable=discordAppIdVar, width=40)
@@ -384,62 +2025,411 @@ def launch_gui():
     goodreadsUserIdEntry.bind("<FocusOut>", lambda e: save_config())
     
     ttk.Label(root, text="displayed book:").grid(row=2, column=0, padx=10, pady=5, sticky="w")
-    bookOptions = [str(title) + " -- " + str(isbn) for isbn, (isbnin, title, author, cover, start) in books.items()]
-    currentBookDropdown = ttk.Combobox(root, textvariable=currentBookVar, values=bookOptions, state="readonly")
+    currentBookDropdown = ttk.Combobox(root, textvariable=currentBookVar, state="disabled")
     currentBookDropdown.grid(row=2, column=1, columnspan=2, padx=10, pady=5, sticky="w")
     currentBookDropdown.bind("<<ComboboxSelected>>", lambda e: save_config())
+    ttk.Label(root, textvariable=shelfStatusVar, foreground="gray").grid(row=3, column=1, columnspan=2, padx=10, sticky="w")
 
     keepRunningCheck = ttk.Checkbutton(root, text="Keep presence running after closing", variable=keepRunningVar)
-    keepRunningCheck.grid(row=3, column=0, columnspan=2, pady=5)
+    keepRunningCheck.grid(row=4, column=0, columnspan=2, pady=5)
     keepRunningVar.trace_add("write", lambda *_: save_config())
     minimizeToTrayCheck = ttk.Checkbutton(root, text="Minimize to tray on close", variable=minimizeToTrayVar)
-    minimizeToTrayCheck.grid(row=4, column=0, columnspan=2, pady=5)
+    minimizeToTrayCheck.grid(row=5, column=0, columnspan=2, pady=5)
     minimizeToTrayVar.trace_add("write", lambda *_: save_config())
     startOnStartupCheck = ttk.Checkbutton(root, text="Start this app on system startup", variable=startOnStartupVar)
-    startOnStartupCheck.grid(row=5, column=0, columnspan=2, pady=5)
+    startOnStartupCheck.grid(row=6, column=0, columnspan=2, pady=5)
     startOnStartupVar.trace_add("write", lambda *_: save_config())
 
-    ttk.Label(root, text="Refresh Interval (seconds):").grid(row=6, column=0, padx=10, pady=5, sticky="w")
+    ttk.Label(root, text="Refresh Interval (seconds):").grid(row=7, column=0, padx=10, pady=5, sticky="w")
     refreshIntervalEntry = ttk.Entry(root, textvariable=refreshIntervalVar, width=10)
-    refreshIntervalEntry.grid(row=6, column=1, padx=10, pady=5)
+    refreshIntervalEntry.grid(row=7, column=1, padx=10, pady=5)
     refreshIntervalEntry.bind("<Return>", lambda e: save_config())
     refreshIntervalEntry.bind("<FocusOut>", lambda e: save_config())
 
+    rotationEnabledCheck = ttk.Checkbutton(root, text="Rotate through all currently-reading books", variable=rotationEnabledVar)
+    rotationEnabledCheck.grid(row=8, column=0, columnspan=2, pady=5)
+    rotationEnabledVar.trace_add("write", lambda *_: save_config())
+    ttk.Label(root, text="Seconds per book:").grid(row=9, column=0, padx=10, pady=5, sticky="w")
+    rotationDwellEntry = ttk.Entry(root, textvariable=rotationDwellVar, width=10)
+    rotationDwellEntry.grid(row=9, column=1, padx=10, pady=5)
+    rotationDwellEntry.bind("<Return>", lambda e: save_config())
+    rotationDwellEntry.bind("<FocusOut>", lambda e: save_config())
+
     root.protocol("WM_DELETE_WINDOW", on_close)
-    
-    def check_tray_quit():
-        if trayQuitEvent.is_set():
-            log("Tray quit event detected, closing GUI.")
-            root.destroy()
+
+    def on_tray_quit_event(event=None):
+        log("Tray quit event detected, closing GUI.")
+        destroy_gui()
+
+    root.bind("<<TrayQuit>>", on_tray_quit_event)
+    root.bind("<<ShowGUI>>", lambda e: showGUI())
+
+    # The window is up before the shelf is known; the dropdown fills in as the runtime publishes books
+    def on_state_changed_event(event=None):
+        state = appState
+        currentBookDropdown["values"] = list(state.labels)
+        if state.labels:
+            currentBookDropdown["state"] = "readonly"
+            # The dropdown is the pinned book; a rotating presence doesn't move it
+            currentBookVar.set(shelfStore.label_for(currentISBN) or state.selectedLabel or "None")
         else:
-            root.after(1000, check_tray_quit)
-    
-    check_tray_quit()
+            currentBookDropdown["state"] = "disabled"
+            currentBookVar.set("Loading books..." if state.shelfStatus == "loading" else "No books found")
+        shelfStatusVar.set(shelfStatusMessages.get(state.shelfStatus, ""))
+
+    root.bind("<<StateChanged>>", on_state_changed_event)
+    on_state_changed_event()
+    posterThread = threading.Thread(target=gui_event_poster, name="gui-events", daemon=True)
+    posterThread.start()
+    # The tray may have quit before the window existed
+    if trayQuitEvent.is_set():
+        root.after_idle(on_tray_quit_event)
     root.mainloop()
+    guiEvents.put(guiEventsStopMarker)
+
+# === Single Instance and Control Channel ===
+# The first instance holds an OS lock on instance.lock and listens on a Unix socket (a named pipe on Windows).
+# Later launches and the command line forward commands to it instead of starting a second scraper and RPC client
+controlCommands = ("show", "refresh", "switch", "pause", "resume", "status", "quit")
+controlConnectAttempts = 10
+
+class InstanceLock:
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def acquire(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lockFile = open(self.path, "a+")
+        try:
+            if sys.platform == "win32":
+                import msvcrt
+                lockFile.seek(0)
+                msvcrt.locking(lockFile.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lockFile.close()
+            return False
+        lockFile.seek(0)
+        lockFile.truncate()
+        lockFile.write(str(os.getpid()))
+        lockFile.flush()
+        # Held open for the life of the process; the OS drops the lock when it exits
+        self.file = lockFile
+        return True
+
+def get_control_address():
+    if sys.platform == "win32":
+        import getpass
+        return rf"\\.\pipe\GoodreadsRPC-{getpass.getuser()}", "AF_PIPE"
+    return os.path.join(os.path.dirname(configFile), "control.sock"), "AF_UNIX"
+
+def get_control_key(create=False):
+    try:
+        with open(controlKeyFile, "r") as f:
+            return bytes.fromhex(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        if not create:
+            return None
+    key = os.urandom(32)
+    descriptor = os.open(controlKeyFile, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "w") as f:
+        f.write(key.hex())
+    return key
+
+# Accepts a book key, a dropdown label or a case-insensitive title
+def resolve_book(value):
+    if not value:
+        return None
+    book = shelfStore.get(value)
+    if book is None and value in shelfStore.labels:
+        book = shelfStore.get(shelfStore.labels[value])
+    if book is None:
+        book = next((book for book in shelfStore if book.title.casefold() == value.casefold()), None)
+    return book
+
+def control_status():
+    state = appState
+    return {
+        "pid": os.getpid(),
+        "paused": not loopShouldRunEvent.is_set(),
+        "book": f"{state.book.title} by {state.book.author}" if state.book else None,
+        "shelfStatus": state.shelfStatus,
+        "books": len(shelfStore),
+        "rotation": bool(configStore.get("rotationEnabled")),
+        "discordConnected": discordConnection.connected,
+        "gui": root is not None,
+    }
+
+def handle_control_command(command, value=None):
+    if command == "show":
+        if root is None:
+            return {"ok": False, "message": "No GUI in headless mode."}
+        post_gui_event("<<ShowGUI>>")
+        return {"ok": True, "message": "Showing the window."}
+    if command == "refresh":
+        presenceScheduler.wake("refresh")
+        return {"ok": True, "message": "Refreshing the shelf."}
+    if command == "switch":
+        book = resolve_book(value)
+        if book is None:
+            return {"ok": False, "message": f"No book on the shelf matches '{value}'."}
+        save_new_isbn(book.key)
+        return {"ok": True, "message": f"Switched to {book.title} by {book.author}."}
+    if command == "pause":
+        loopShouldRunEvent.clear()
+        presenceScheduler.wake("pause")
+        return {"ok": True, "message": "Presence paused."}
+    if command == "resume":
+        loopShouldRunEvent.set()
+        presenceScheduler.wake("resume")
+        return {"ok": True, "message": "Presence resumed."}
+    if command == "status":
+        return {"ok": True, "message": "Running.", "status": control_status()}
+    if command == "quit":
+        # Carried out by serve_control once the reply is sent; stopping first can end the process mid-reply
+        return {"ok": True, "message": "Quitting.", "quit": True}
+    return {"ok": False, "message": f"Unknown command '{command}'."}
+
+def quit_from_control():
+    stop_presence_runtime()
+    post_gui_event("<<TrayQuit>>")
+    if trayIcon is not None:
+        trayIcon.stop()
+
+# Requests and replies are single JSON messages; the authkey handshake runs before either is read
+def serve_control(listener):
+    from multiprocessing import AuthenticationError
+    while not trayQuitEvent.is_set():
+        try:
+            connection = listener.accept()
+        except AuthenticationError:
+            log("Rejected a control connection with the wrong key.", LOG_WARNING)
+            continue
+        except OSError:
+            break
+        with connection:
+            try:
+                request = json.loads(connection.recv_bytes(65536))
+                log(f"Control command: {request.get('command')}", LOG_DEBUG)
+                reply = handle_control_command(request.get("command"), request.get("value"))
+            except Exception as e:
+                reply = {"ok": False, "message": f"Control command failed: {e}"}
+            quitting = reply.pop("quit", False)
+            try:
+                connection.send_bytes(json.dumps(reply).encode("utf-8"))
+            except OSError:
+                pass
+        if quitting:
+            quit_from_control()
+
+def start_control_server():
+    from multiprocessing.connection import Listener
+    address, family = get_control_address()
+    # Only the lock holder gets here, so a socket file left behind is from a crashed instance
+    if family == "AF_UNIX" and os.path.exists(address):
+        os.remove(address)
+    try:
+        listener = Listener(address, family=family, authkey=get_control_key(create=True))
+    except Exception as e:
+        log(f"Control channel unavailable: {e}", LOG_WARNING)
+        return None
+    threading.Thread(target=serve_control, args=(listener,), name="control", daemon=True).start()
+    log(f"Control channel listening on {address}", LOG_DEBUG)
+    return listener
+
+# Retries briefly because the running instance may still be starting up its listener
+def send_control_command(command, value=None):
+    from multiprocessing.connection import Client
+    address, family = get_control_address()
+    lastError = None
+    for attempt in range(controlConnectAttempts):
+        key = get_control_key()
+        if key is not None:
+            try:
+                with Client(address, family=family, authkey=key) as connection:
+                    connection.send_bytes(json.dumps({"command": command, "value": value}).encode("utf-8"))
+                    return json.loads(connection.recv_bytes(65536))
+            except Exception as e:
+                lastError = e
+        time.sleep(0.2)
+    return {"ok": False, "message": f"The running instance did not answer: {lastError or 'no control key'}"}
+
+def run_control_client(command, value=None):
+    reply = send_control_command(command, value)
+    print(reply.get("message", ""))
+    if "status" in reply:
+        print(json.dumps(reply["status"], indent=4))
+    return 0 if reply.get("ok") else 1
+
+# === Headless Mode ===
+# Fetch and presence only: no Tk, tray or PIL imports, presence loop on the main thread
+def run_headless():
+    log("Running headless.")
+    loopShouldRunEvent.set()
+    try:
+        run_profiled(run_presence)
+    except KeyboardInterrupt:
+        log("Headless run interrupted, exiting.")
+        trayQuitEvent.set()
+
+# === Batch Mode ===
+# Polls many accounts' shelves on one loop and one connection pool and writes a JSON line per account.
+# Nothing goes to Discord, and the app's own config, shelf cache and instance lock are left alone
+batchCacheDir = os.path.join(os.path.dirname(configFile), "shelf_cache")
+batchUserIdPattern = re.compile(r"^[\w-]+$")
+
+# One ID per line; blank lines and # comments are skipped and repeats dropped
+def read_batch_user_ids(path):
+    with (contextlib.nullcontext(sys.stdin) if path == "-" else open(path, "r")) as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    userIds = []
+    for userId in dict.fromkeys(line for line in lines if line):
+        if batchUserIdPattern.match(userId):
+            userIds.append(userId)
+        else:
+            log(f"Skipping invalid Goodreads user ID '{userId}'.", LOG_WARNING)
+    return userIds
+
+def get_batch_cache_file(userId):
+    return os.path.join(batchCacheDir, f"{userId}.json")
+
+# Each account gets its own auto source so one account's probe doesn't pick the source for the others
+def get_batch_source(sourceName, userId, autoSources):
+    if sourceName == "auto":
+        return autoSources.setdefault(userId, AutoShelfSource(htmlShelfSource, rssShelfSource))
+    return shelfSources[sourceName]
+
+async def poll_batch_account(userId, source, output, useCache):
+    startedAt = time.perf_counter()
+    result = await fetch_currently_reading(userId, source, get_batch_cache_file(userId) if useCache else None)
+    record = {
+        "userId": userId,
+        "ok": result.books is not None,
+        "changed": result.changed,
+        "source": result.source,
+        "seconds": round(time.perf_counter() - startedAt, 3),
+        "retryAfter": result.retryAfter,
+        "books": None if result.books is None else [book.to_row() for book in result.books.values()],
+    }
+    output.write(json.dumps(record) + "\n")
+    output.flush()
+    metrics.increment("batch_accounts")
+    if not record["ok"]:
+        metrics.increment("batch_failures")
+    return record
+
+# A fixed set of workers pulls from the shared ID list so at most batchWorkers accounts are in flight
+async def run_batch_pass(userIds, sourceName, workers, output, useCache, autoSources):
+    pending = iter(userIds)
+    records = []
+
+    async def worker():
+        for userId in pending:
+            records.append(await poll_batch_account(userId, get_batch_source(sourceName, userId, autoSources), output, useCache))
+
+    startedAt = time.monotonic()
+    await asyncio.gather(*(worker() for _ in range(min(workers, len(userIds)))))
+    elapsed = time.monotonic() - startedAt
+    succeeded = sum(record["ok"] for record in records)
+    accountsPerMinute = len(records) / elapsed * 60 if elapsed > 0 else 0
+    metrics.set_gauge("batch_accounts_per_minute", round(accountsPerMinute, 1))
+    summary = f"Batch pass: {len(records)} account(s), {succeeded} ok, {len(records) - succeeded} failed in {elapsed:.1f}s ({accountsPerMinute:.1f} accounts/min)."
+    log(summary)
+    print(summary, file=sys.stderr)
+    return succeeded
+
+async def run_batch_runtime(userIds, sourceName, workers, interval, output, useCache):
+    autoSources = {}
+    try:
+        while True:
+            startedAt = time.monotonic()
+            succeeded = await run_batch_pass(userIds, sourceName, workers, output, useCache, autoSources)
+            if interval <= 0:
+                return succeeded
+            await asyncio.sleep(max(0, interval - (time.monotonic() - startedAt)))
+    finally:
+        await close_http_session()
+
+def run_batch(args):
+    global maxPageWorkers
+    userIds = read_batch_user_ids(args.batch)
+    if not userIds:
+        print("No Goodreads user IDs to poll.", file=sys.stderr)
+        return 1
+    sourceName = args.batch_source or configStore.get("shelfSource", "auto")
+    if sourceName not in shelfSources:
+        log(f"Unknown shelfSource '{sourceName}', using html.", LOG_WARNING)
+        sourceName = "html"
+    # The session's connector is the shared pool, so it is sized for every worker before it is created
+    maxPageWorkers = max(1, args.batch_workers)
+    hostRateLimiter.interval = 1 / args.batch_rate if args.batch_rate > 0 else 0
+    if args.batch_cache:
+        os.makedirs(batchCacheDir, exist_ok=True)
+        seeded = sum(load_shelf_cache(userId, get_batch_cache_file(userId)) is not None for userId in userIds)
+        log(f"Seeded revalidation state for {seeded} of {len(userIds)} account(s) from {batchCacheDir}.", LOG_DEBUG)
+    log(f"Batch polling {len(userIds)} account(s) with {maxPageWorkers} worker(s) via {sourceName}.")
+    output = open(args.batch_output, "a") if args.batch_output else sys.stdout
+    try:
+        succeeded = asyncio.run(run_batch_runtime(userIds, sourceName, maxPageWorkers, args.batch_interval, output, args.batch_cache))
+    except KeyboardInterrupt:
+        log("Batch run interrupted, exiting.")
+        return 0
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0 if succeeded else 1
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Show your Goodreads currently-reading book as Discord Rich Presence.")
+    parser.add_argument("--headless", action="store_true", help="run without the GUI and tray icon")
+    parser.add_argument("--profile", action="store_true", help=f"record a cProfile of the presence loop to {profileFile}")
+    parser.add_argument("--trace-memory", action="store_true", help="log tracemalloc's top allocations after every refresh")
+    parser.add_argument("--batch", metavar="FILE", help="poll the shelves of the Goodreads user IDs in FILE (one per line, - for stdin) and exit")
+    parser.add_argument("--batch-output", metavar="FILE", help="append batch results as JSON lines to FILE instead of stdout")
+    parser.add_argument("--batch-cache", action="store_true", help=f"keep a shelf cache per account in {batchCacheDir} so repeat runs revalidate")
+    parser.add_argument("--batch-workers", type=int, default=8, help="accounts fetched at once, and the size of the shared connection pool (default 8)")
+    parser.add_argument("--batch-rate", type=float, default=2, help="max requests per second to each host, 0 for no limit (default 2)")
+    parser.add_argument("--batch-interval", type=float, default=0, help="repeat the batch every this many seconds instead of running once")
+    parser.add_argument("--batch-source", choices=sorted(shelfSources), help="shelf source for batch mode (default: shelfSource from config.json)")
+    parser.add_argument("command", nargs="?", choices=controlCommands, help="send a command to the running instance instead of starting one")
+    parser.add_argument("value", nargs="?", help="book ISBN, label or title for switch")
+    return parser.parse_args(argv)
 
 # === Main ===
 if __name__ == "__main__":
+    args = parse_args()
+    if args.batch:
+        # Batch mode never touches Discord or the GUI, so it runs alongside the app without the instance lock
+        init_config()
+        sys.exit(run_batch(args))
+    instanceLock = InstanceLock(instanceLockFile)
+    if not instanceLock.acquire():
+        # Another copy owns the shelf, Discord and config; a plain relaunch just brings its window up
+        sys.exit(run_control_client(args.command or "show", args.value))
+    if args.command not in (None, "show"):
+        print("Goodreads RPC is not running.")
+        sys.exit(1)
+    init_config()
     log("Starting Goodreads Discord RPC application.")
-    books = get_currently_reading(goodreadsUserId)
-    if books:
-        if currentISBN:
-            if currentISBN in books:
-                currentBook["isbn"], currentBook["title"], currentBook["author"], currentBook["cover"], currentBook["start"] = books[currentISBN]
-                log(f"Current book: {currentBook['title']} by {currentBook['author']}")
-            else:
-                default_isbn = list(books.keys())[0]
-                currentBook["isbn"], currentBook["title"], currentBook["author"], currentBook["cover"], currentBook["start"] = books[default_isbn]
-                log(f"Current book: {currentBook['title']} by {currentBook['author']}")
-        else:
-            default_isbn = list(books.keys())[0]
-            currentBook["isbn"], currentBook["title"], currentBook["author"], currentBook["cover"], currentBook["start"] = books[default_isbn]
-            log(f"Current book: {currentBook['title']} by {currentBook['author']}")
-    else:
-        log("No currently reading book found.")
-    
+    profilingEnabled = args.profile
+    memoryTracingEnabled = args.trace_memory
+    if memoryTracingEnabled:
+        start_memory_tracing()
+    if configStore.get("metricsPort"):
+        start_metrics_server(int(configStore.get("metricsPort")))
+    shelfStore.subscribe(on_shelf_changed)
+    start_control_server()
+
+    if args.headless:
+        run_headless()
+        sys.exit(0)
+
     loopShouldRunEvent.set()
 
-    loopThread = threading.Thread(target=presence_loop, daemon=True)
+    loopThread = threading.Thread(target=run_profiled, args=(run_presence,), name="presence-runtime", daemon=True)
     loopThread.start()
     trayThread = threading.Thread(target=show_tray, daemon=True)
     trayThread.start()
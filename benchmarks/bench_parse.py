@@ -0,0 +1,36 @@
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from common import fixtureSizes, load_app, load_fixture
+
+def measure(parse, html, rounds):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        parse(html)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Goodreads #books table parser.")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    app = load_app()
+
+    print(f"{'rows':>6} {'page KiB':>9} {'median ms':>10} {'min ms':>8} {'peak KiB':>9}")
+    for rowCount in fixtureSizes:
+        html = load_fixture(rowCount)
+        books = app.parse_book_table(html)
+        assert books and len(books) == rowCount, f"parser returned {len(books or ())} of {rowCount} rows"
+        timings, peak = measure(app.parse_book_table, html, args.rounds)
+        print(f"{rowCount:>6} {len(html) / 1024:>9.1f} {statistics.median(timings) * 1000:>10.2f} {min(timings) * 1000:>8.2f} {peak / 1024:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+benchmarksDir = os.path.dirname(os.path.realpath(__file__))
+
+# Each probe runs in a fresh interpreter so import caches and RSS start from zero
+probeTemplate = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {benchmarksDir!r})
+from common import load_app
+app = load_app()
+{extra}
+elapsed = time.perf_counter() - started
+try:
+    import resource
+    maxRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    maxRss = maxRss / 1024 if sys.platform == "darwin" else maxRss
+except ImportError:
+    maxRss = None
+print(json.dumps({{"seconds": elapsed, "maxRssKiB": maxRss}}))
+"""
+
+scenarios = {
+    "headless": "",
+    "headless+parser": "import bs4",
+    "gui": "import bs4, tkinter, tkinter.ttk, pystray, PIL.Image, PIL.ImageDraw",
+}
+
+def run_probe(extra):
+    code = probeTemplate.format(benchmarksDir=benchmarksDir, extra=extra)
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if completed.returncode != 0:
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time and RSS of the headless and GUI paths.")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'scenario':<16} {'median ms':>10} {'max RSS MiB':>12}")
+    for name, extra in scenarios.items():
+        results = [run_probe(extra) for _ in range(args.rounds)]
+        results = [result for result in results if result]
+        if not results:
+            print(f"{name:<16} {'unavailable':>10}")
+            continue
+        seconds = statistics.median(result["seconds"] for result in results)
+        rss = [result["maxRssKiB"] for result in results if result["maxRssKiB"] is not None]
+        rssText = f"{statistics.median(rss) / 1024:>12.1f}" if rss else f"{'n/a':>12}"
+        print(f"{name:<16} {seconds * 1000:>10.1f} {rssText}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import importlib.util
+import os
+import sys
+
+repoRoot = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+appPath = os.path.join(repoRoot, "GR-CustomDiscordStatus.py")
+
+# The app script has a dash in its name, so it can't be imported normally
+def load_app():
+    if "grrpc" in sys.modules:
+        return sys.modules["grrpc"]
+    spec = importlib.util.spec_from_file_location("grrpc", appPath)
+    app = importlib.util.module_from_spec(spec)
+    sys.modules["grrpc"] = app
+    spec.loader.exec_module(app)
+    return app
+
+# === Shelf Fixtures ===
+# Rows mirror the markup of goodreads.com/review/list, including rows with no ISBN and no start date
+def shelf_row(index, revision=0):
+    isbn = "" if index % 7 == 3 else f"{9780000000000 + index}"
+    if index % 5 == 2:
+        startDate = '<span class="greyText">not set</span>'
+    else:
+        startDate = f'<span class="date_started_value">Mar {index % 28 + 1:02d}, 2025</span>'
+    return f'''<tr id="review_{5000000 + index}" class="bookalike review">
+  <td class="field checkbox"><label>checkbox</label><div class="value"><input type="checkbox" name="reviews[{index}]" /></div></td>
+  <td class="field position" style="display: none"><label>position</label><div class="value"></div></td>
+  <td class="field cover"><label>cover</label><div class="value"><div class="js-tooltipTrigger tooltipTrigger" data-resource-id="{index}"><a href="/book/show/{index}"><img alt="Book {index}" id="cover_review_{index}" src="https://i.gr-assets.com/images/S/compressed.photo.goodreads.com/books/{1600000000 + index}l/{index}._SY75_.jpg" /></a></div></div></td>
+  <td class="field title"><label>title</label><div class="value"><a title="Book {index}" href="/book/show/{index}">Book {index}{" (revised)" if revision else ""}</a></div></td>
+  <td class="field author"><label>author</label><div class="value"><a href="/author/show/{index}">Author, Some {index}</a>*</div></td>
+  <td class="field isbn" style="display: none"><label>isbn</label><div class="value">{isbn}</div></td>
+  <td class="field num_pages"><label>num pages</label><div class="value"><nobr>{200 + index} <span class="greyText">pp</span></nobr></div></td>
+  <td class="field avg_rating"><label>avg rating</label><div class="value">4.{index % 10}</div></td>
+  <td class="field rating"><label>my rating</label><div class="value"><div class="stars" data-rating="0"></div></div></td>
+  <td class="field date_started"><label>date started</label><div class="value"><div class="editable_date date_started_{index}">{startDate}</div></div></td>
+  <td class="field date_added"><label>date added</label><div class="value"><span title="March 1, 2025">Mar 01, 2025</span></div></td>
+  <td class="field actions"><label>actions</label><div class="value"><a class="actionLinkLite" href="/review/edit/{index}">edit</a></div></td>
+</tr>'''
+
+def shelf_page(rowCount, page=1, pageCount=1, perPage=None, revision=0):
+    perPage = perPage or rowCount
+    first = (page - 1) * perPage
+    rows = "\n".join(shelf_row(index, revision) for index in range(first, min(first + perPage, rowCount)))
+    pagination = "".join(
+        f'<a href="/review/list/1?page={number}&amp;shelf=currently-reading">{number}</a> '
+        for number in range(1, pageCount + 1) if number != page
+    )
+    header = "\n".join(f'<link rel="stylesheet" href="/assets/style-{number}.css" />' for number in range(40))
+    scripts = "\n".join(f'<script>var widget{number} = {{"id": {number}, "payload": "{"x" * 400}"}};</script>' for number in range(60))
+    return f'''<!DOCTYPE html>
+<html><head><title>Currently Reading</title>
+{header}
+</head><body>
+<div class="siteHeader"><nav>{"<a href='/nav'>link</a>" * 50}</nav></div>
+<div id="leftCol"><div id="shelvesSection">{"<a class='userShelf'>shelf</a>" * 30}</div></div>
+<table id="books" class="table stacked" border="0">
+<thead><tr id="booksHeader"><th class="header field cover">cover</th><th class="header field title">title</th></tr></thead>
+<tbody id="booksBody">
+{rows}
+</tbody>
+</table>
+<div id="reviewPagination">{pagination}</div>
+<div class="siteFooter">{"<a href='/footer'>link</a>" * 80}</div>
+{scripts}
+</body></html>'''
+
+# Items mirror goodreads.com/review/list_rss, which spells authors "First Last" and carries no start date
+def shelf_rss_item(index, revision=0):
+    isbn = "" if index % 7 == 3 else f"{9780000000000 + index}"
+    return f'''<item>
+  <guid><![CDATA[https://www.goodreads.com/review/show/{5000000 + index}?utm_medium=api&utm_source=rss]]></guid>
+  <pubDate><![CDATA[Sat, 01 Mar 2025 10:00:00 -0800]]></pubDate>
+  <title>Book {index}{" (revised)" if revision else ""}</title>
+  <link><![CDATA[https://www.goodreads.com/review/show/{5000000 + index}?utm_medium=api&utm_source=rss]]></link>
+  <book_id>{index}</book_id>
+  <book_image_url><![CDATA[https://i.gr-assets.com/images/S/compressed.photo.goodreads.com/books/{1600000000 + index}l/{index}._SY75_.jpg]]></book_image_url>
+  <book_large_image_url><![CDATA[https://i.gr-assets.com/images/S/compressed.photo.goodreads.com/books/{1600000000 + index}l/{index}._SY475_.jpg]]></book_large_image_url>
+  <book_description><![CDATA[{"A long description. " * 20}]]></book_description>
+  <book id="{index}"><num_pages>{200 + index}</num_pages></book>
+  <author_name>Some Author {index}</author_name>
+  <isbn>{isbn}</isbn>
+  <user_name>Reader</user_name>
+  <user_rating>0</user_rating>
+  <user_read_at></user_read_at>
+  <user_date_added><![CDATA[Sat, 01 Mar 2025 10:00:00 -0800]]></user_date_added>
+  <user_shelves>currently-reading</user_shelves>
+  <average_rating>4.{index % 10}</average_rating>
+</item>'''
+
+def shelf_rss(rowCount, revision=0):
+    items = "\n".join(shelf_rss_item(index, revision) for index in range(rowCount))
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+<channel>
+  <title>Reader's bookshelf: currently-reading</title>
+  <link><![CDATA[https://www.goodreads.com/review/list_rss/1?shelf=currently-reading]]></link>
+{items}
+</channel>
+</rss>'''
+
+# === Saved Fixtures ===
+# Checked-in copies of shelf_page() so benchmark numbers stay comparable while the generator changes
+fixtureDir = os.path.join(os.path.dirname(os.path.realpath(__file__)), "fixtures")
+fixtureSizes = (1, 50, 500)
+
+def fixture_path(rowCount):
+    return os.path.join(fixtureDir, f"shelf_{rowCount}.html")
+
+def load_fixture(rowCount):
+    with open(fixture_path(rowCount), "r", encoding="utf-8") as f:
+        return f.read()
+
+def save_fixtures():
+    os.makedirs(fixtureDir, exist_ok=True)
+    for rowCount in fixtureSizes:
+        with open(fixture_path(rowCount), "w", encoding="utf-8", newline="\n") as f:
+            f.write(shelf_page(rowCount))
+
+if __name__ == "__main__":
+    save_fixtures()
@@ -0,0 +1,328 @@
+import argparse
+import json
+import os
+import resource
+import shutil
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from common import appPath, shelf_page, shelf_rss
+
+# === Goodreads Stand-in ===
+# Serves generated shelf pages with ETags and can be switched to slow, failing or changed content mid-run
+class GoodreadsStandIn:
+    def __init__(self, rows=5, perPage=20):
+        self.rows = rows
+        self.perPage = perPage
+        self.revision = 0
+        self.delay = 0.0
+        self.failStatus = None
+        self.retryAfter = None
+        self.lock = threading.Lock()
+        self.requests = []
+        standIn = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                standIn.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+
+    def handle(self, handler):
+        with self.lock:
+            rows, perPage, revision, delay = self.rows, self.perPage, self.revision, self.delay
+            failStatus, retryAfter = self.failStatus, self.retryAfter
+        url = urlparse(handler.path)
+        page = int(parse_qs(url.query).get("page", ["1"])[0])
+        isFeed = "/list_rss/" in url.path
+        if delay:
+            time.sleep(delay)
+        if failStatus:
+            self.record(page, failStatus)
+            handler.send_response(failStatus)
+            if retryAfter is not None:
+                handler.send_header("Retry-After", str(retryAfter))
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        etag = f'"{"rss" if isFeed else "html"}-{rows}-{perPage}-{revision}-{page}"'
+        if handler.headers.get("If-None-Match") == etag:
+            self.record(page, 304)
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.end_headers()
+            return
+        if isFeed:
+            body = shelf_rss(rows, revision=revision).encode("utf-8")
+        else:
+            pageCount = max(1, -(-rows // perPage))
+            body = shelf_page(rows, page=page, pageCount=pageCount, perPage=perPage, revision=revision).encode("utf-8")
+        self.record(page, 200, len(body))
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/rss+xml; charset=utf-8" if isFeed else "text/html; charset=utf-8")
+        handler.send_header("ETag", etag)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def record(self, page, status, size=0):
+        with self.lock:
+            self.requests.append((time.monotonic(), page, status, size))
+
+    def set(self, **changes):
+        with self.lock:
+            for name, value in changes.items():
+                setattr(self, name, value)
+
+# === Discord Stand-in ===
+# Speaks Discord's IPC framing (little-endian op and length, then JSON) on a Unix socket and records activities
+class FakeDiscord:
+    def __init__(self, runtimeDir, replyDelay=0.0):
+        self.path = os.path.join(runtimeDir, "discord-ipc-0")
+        self.replyDelay = replyDelay
+        self.lock = threading.Lock()
+        self.frames = []
+        self.connections = 0
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.path)
+        self.server.listen()
+
+    def start(self):
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.close()
+
+    def accept_loop(self):
+        while True:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self.serve, args=(connection,), daemon=True).start()
+
+    def read_exact(self, connection, size):
+        data = b""
+        while len(data) < size:
+            chunk = connection.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    def send(self, connection, op, payload):
+        data = json.dumps(payload).encode("utf-8")
+        connection.sendall(struct.pack("<II", op, len(data)) + data)
+
+    def serve(self, connection):
+        with connection:
+            while True:
+                header = self.read_exact(connection, 8)
+                if header is None:
+                    return
+                op, length = struct.unpack("<II", header)
+                message = json.loads(self.read_exact(connection, length) or b"{}")
+                if op == 0:
+                    with self.lock:
+                        self.connections += 1
+                    self.send(connection, 1, {"cmd": "DISPATCH", "evt": "READY", "data": {"v": 1, "user": {"id": "0", "username": "harness"}}})
+                elif op == 1:
+                    if self.replyDelay:
+                        time.sleep(self.replyDelay)
+                    activity = message.get("args", {}).get("activity")
+                    with self.lock:
+                        self.frames.append((time.monotonic(), activity))
+                    self.send(connection, 1, {"cmd": message.get("cmd"), "evt": None, "nonce": message.get("nonce"), "data": activity})
+                elif op == 2:
+                    return
+
+    def first_frame_after(self, since, predicate):
+        with self.lock:
+            for receivedAt, activity in self.frames:
+                if receivedAt >= since and predicate(activity):
+                    return receivedAt
+        return None
+
+# === App Runner ===
+# Runs the real app headless in a child process with its own config dir, log dir and Discord socket dir
+class AppProcess:
+    def __init__(self, workDir, standIn, refreshInterval, shelfSource):
+        self.workDir = workDir
+        self.appDataDir = os.path.join(workDir, "appdata")
+        os.makedirs(os.path.join(self.appDataDir, "GoodreadsRPC"))
+        with open(os.path.join(self.appDataDir, "GoodreadsRPC", "config.json"), "w") as f:
+            json.dump({
+                "discordAppId": "1356666997760462859",
+                "goodreadsUserId": "1",
+                "refreshInterval": refreshInterval,
+                "goodreadsBaseUrl": standIn.url,
+                "shelfSource": shelfSource,
+                "logLevel": "INFO",
+            }, f)
+        # The app logs next to its own script, so run a copy inside the scratch directory
+        self.scriptPath = os.path.join(workDir, os.path.basename(appPath))
+        shutil.copy(appPath, self.scriptPath)
+        self.process = None
+
+    def start(self):
+        env = dict(os.environ, APPDATA=self.appDataDir, XDG_RUNTIME_DIR=self.workDir)
+        env.pop("CI", None)
+        env.pop("GITHUB_ACTIONS", None)
+        self.process = subprocess.Popen([sys.executable, self.scriptPath, "--headless"], env=env, cwd=self.workDir)
+        return self
+
+    # CPU seconds (user + system) the running child has used so far; None where /proc is unavailable
+    def cpu_seconds(self):
+        try:
+            with open(f"/proc/{self.process.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            return None
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+    # Returns the child's total CPU seconds, startup included
+    def stop(self):
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        self.process.send_signal(signal.SIGINT)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+
+# === Scenarios ===
+def wait_for(predicate, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(0.05)
+    return None
+
+def is_revised(activity):
+    return bool(activity) and "(revised)" in activity.get("details", "")
+
+def scenario_steady(standIn, discord, duration):
+    time.sleep(duration)
+    return {}
+
+def scenario_change(standIn, discord, duration):
+    time.sleep(duration / 2)
+    changedAt = time.monotonic()
+    standIn.set(revision=1)
+    seenAt = wait_for(lambda: discord.first_frame_after(changedAt, is_revised), duration)
+    remaining = duration / 2 - (time.monotonic() - changedAt)
+    if remaining > 0:
+        time.sleep(remaining)
+    return {"updateLatency": seenAt - changedAt if seenAt else None}
+
+def scenario_slow(standIn, discord, duration):
+    standIn.set(delay=2.0)
+    return scenario_change(standIn, discord, duration)
+
+def scenario_errors(standIn, discord, duration):
+    time.sleep(duration / 4)
+    standIn.set(failStatus=429, retryAfter=3)
+    time.sleep(duration / 4)
+    standIn.set(failStatus=500, retryAfter=None)
+    time.sleep(duration / 4)
+    recoveredAt = time.monotonic()
+    standIn.set(failStatus=None, revision=1)
+    seenAt = wait_for(lambda: discord.first_frame_after(recoveredAt, is_revised), duration)
+    return {"updateLatency": seenAt - recoveredAt if seenAt else None}
+
+scenarios = {
+    "steady": scenario_steady,
+    "change": scenario_change,
+    "slow": scenario_slow,
+    "errors": scenario_errors,
+}
+
+def run_scenario(name, duration, rows, refreshInterval, shelfSource):
+    workDir = tempfile.mkdtemp(prefix="grrpc-harness-")
+    standIn = GoodreadsStandIn(rows=rows).start()
+    discord = FakeDiscord(workDir).start()
+    app = AppProcess(workDir, standIn, refreshInterval, shelfSource)
+    try:
+        app.start()
+        if not wait_for(lambda: discord.frames, 30):
+            raise RuntimeError("the app never sent a presence frame")
+        startedAt = time.monotonic()
+        cpuBefore = app.cpu_seconds()
+        result = scenarios[name](standIn, discord, duration)
+        elapsed = time.monotonic() - startedAt
+        cpuAfter = app.cpu_seconds()
+        cpuSeconds = app.stop()
+        # Prefer CPU measured over the scenario window so interpreter startup is not charged to the cycles
+        if cpuBefore is not None and cpuAfter is not None:
+            cpuSeconds = cpuAfter - cpuBefore
+    finally:
+        if app.process and app.process.poll() is None:
+            app.process.kill()
+        standIn.stop()
+        discord.stop()
+        shutil.rmtree(workDir, ignore_errors=True)
+    requests = [request for request in standIn.requests if request[0] >= startedAt]
+    cycles = max(1, len([request for request in requests if request[1] == 1]))
+    result.update({
+        "scenario": name,
+        "seconds": elapsed,
+        "requests": len(requests),
+        "requestsPerHour": len(requests) * 3600 / elapsed,
+        "bytes": sum(request[3] for request in requests),
+        "frames": len(discord.frames),
+        "cpuMsPerCycle": cpuSeconds * 1000 / cycles,
+    })
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the app end to end against local Goodreads and Discord stand-ins.")
+    parser.add_argument("scenarios", nargs="*", default=list(scenarios), help=f"any of: {', '.join(scenarios)}")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run each scenario")
+    parser.add_argument("--rows", type=int, default=5, help="books on the stand-in shelf")
+    parser.add_argument("--refresh-interval", type=int, default=2, help="refreshInterval written to the app's config")
+    parser.add_argument("--source", default="auto", choices=["html", "rss", "auto"], help="shelfSource written to the app's config")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per scenario")
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in scenarios]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    if not hasattr(socket, "AF_UNIX"):
+        sys.exit("The harness needs Unix domain sockets for the Discord stand-in.")
+
+    if not args.json:
+        print(f"{'scenario':<10} {'requests':>8} {'req/hour':>9} {'KiB':>8} {'frames':>7} {'latency s':>10} {'CPU ms/cycle':>13}")
+    for name in args.scenarios:
+        result = run_scenario(name, args.duration, args.rows, args.refresh_interval, args.source)
+        if args.json:
+            print(json.dumps(result))
+            continue
+        latency = result.get("updateLatency")
+        latencyText = f"{latency:>10.2f}" if latency is not None else f"{'-':>10}"
+        print(f"{name:<10} {result['requests']:>8} {result['requestsPerHour']:>9.0f} {result['bytes'] / 1024:>8.1f} {result['frames']:>7} {latencyText} {result['cpuMsPerCycle']:>13.1f}")
+
+if __name__ == "__main__":
+    main()
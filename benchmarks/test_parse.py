@@ -0,0 +1,40 @@
+import tracemalloc
+
+import pytest
+
+from common import fixtureSizes, load_app, load_fixture
+
+# Run with: python -m pytest benchmarks/test_parse.py
+# Regenerate the saved pages with: python benchmarks/common.py
+
+def peak_memory(parse, html):
+    tracemalloc.start()
+    try:
+        parse(html)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+@pytest.fixture(scope="module")
+def app():
+    return load_app()
+
+@pytest.mark.parametrize("rowCount", fixtureSizes)
+def test_parse_book_table(benchmark, app, rowCount):
+    html = load_fixture(rowCount)
+    benchmark.extra_info["rows"] = rowCount
+    benchmark.extra_info["pageKiB"] = round(len(html) / 1024, 1)
+    benchmark.extra_info["peakKiB"] = round(peak_memory(app.parse_book_table, html) / 1024, 1)
+    books = benchmark(app.parse_book_table, html)
+    assert books and len(books) == rowCount
+
+# Steady state of a refresh: every row fingerprint matches the previous fetch, so nothing is re-parsed
+@pytest.mark.parametrize("rowCount", fixtureSizes)
+def test_parse_unchanged_rows(benchmark, app, rowCount):
+    html = load_fixture(rowCount)
+    state = {}
+    app.parse_changed_rows(html, state)
+    benchmark.extra_info["rows"] = rowCount
+    benchmark.extra_info["peakKiB"] = round(peak_memory(lambda page: app.parse_changed_rows(page, state), html) / 1024, 1)
+    books = benchmark(app.parse_changed_rows, html, state)
+    assert books and len(books) == rowCount
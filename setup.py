@@ -28,7 +28,7 @@ if tcl_dir and tk_dir:
 
 OPTIONS = {
     'argv_emulation': True,
-    'packages': ['requests', 'bs4', 'pypresence', 'pystray'],
+    'packages': ['aiohttp', 'bs4', 'pypresence', 'pystray'],
     'includes': ['PIL.Image', 'PIL.ImageDraw', 'tkinter'],
     'iconfile': 'icon.icns',
     'resources': resource_list,